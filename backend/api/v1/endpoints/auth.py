@@ -1,6 +1,8 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import JSONResponse
 
+from database.core import get_db_session
 from models.api.token import TokenPayload
 from models.core.user import UserCreate, UserLogin
 from services.core.user_service import UserService
@@ -13,9 +15,13 @@ router = APIRouter(
 
 
 @router.post(path="/register", response_class=JSONResponse, response_model=TokenPayload)
-async def register_new_user(user_data: UserCreate) -> str | TokenPayload:
+async def register_new_user(
+        user_data: UserCreate,
+        session: AsyncSession = Depends(get_db_session)
+) -> str | TokenPayload:
     new_user = await UserService.create_user(
-        user_data=user_data
+        user_data=user_data,
+        session=session
     )
 
     if not new_user: return "error"
@@ -32,9 +38,13 @@ async def register_new_user(user_data: UserCreate) -> str | TokenPayload:
 
 
 @router.post(path="/login", response_class=JSONResponse, response_model=TokenPayload)
-async def login_user(credentials: UserLogin):
+async def login_user(
+        credentials: UserLogin,
+        session: AsyncSession = Depends(get_db_session)
+):
     user = await UserService.auth_user(
-        credentials=credentials
+        credentials=credentials,
+        session=session
     )
 
     if not user: return "error"
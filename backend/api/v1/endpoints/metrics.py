@@ -0,0 +1,36 @@
+from fastapi import APIRouter
+
+from database.core import pool_metrics
+from services.awareness import awareness_metrics
+from services.broadcast_group import broadcast_metrics
+from services.cache import cache_metrics
+from services.collaboration import collaboration
+from services.peer import heartbeat_metrics
+from services.send_queue import send_queue_metrics
+from services.update_log import update_log_metrics
+from utils.hash_manager import hash_metrics
+from utils.jwt_manager import token_cache
+
+
+router = APIRouter(
+    prefix="/metrics",
+    tags=["metrics"]
+)
+
+
+@router.get(path="")
+async def get_metrics():
+    return {
+        "db_pool": pool_metrics.snapshot(),
+        "cache": cache_metrics.snapshot(),
+        "bcrypt": hash_metrics.snapshot(),
+        "jwt_cache": token_cache.snapshot(),
+        "fanout": collaboration.fanout.snapshot(),
+        "coalescer": collaboration.coalescer.snapshot(),
+        "awareness": awareness_metrics.snapshot(),
+        "send_queues": send_queue_metrics.snapshot(),
+        "broadcast": broadcast_metrics.snapshot(),
+        "heartbeat": heartbeat_metrics.snapshot(),
+        "update_log": update_log_metrics.snapshot(),
+        "rooms": collaboration.documents.snapshot(active=collaboration.rooms)
+    }
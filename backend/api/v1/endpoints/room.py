@@ -1,6 +1,8 @@
 from typing import Optional
-from fastapi import APIRouter, Depends
+from fastapi import APIRouter, Depends, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.responses import JSONResponse
+from database.core import get_db_session
 from models.api.room import (
     RoomRemoveInvited,
     RoomUpdateRequest,
@@ -9,11 +11,13 @@ from models.api.room import (
     RoomConnectingRequest,
     RoomInviteLinkResponse, RoomAccessRequest
 )
-from services.collaboration import Collaboration
+from models.api.token import TokenPrincipal
+from services.collaboration import Collaboration, collaboration
 from services.core.room_service import RoomService
 from services.redis_client import get_redis_client
-from utils.jwt_manager import decode_access_token
-from api.v1.endpoints.websocket import collaboration
+from utils.auth import get_principal
+from utils.http_cache import is_not_modified, make_etag, not_modified, validator_headers
+from utils.pagination import PageParams
 
 
 router = APIRouter(
@@ -23,39 +27,44 @@ router = APIRouter(
 
 
 @router.post(path="/create")
-async def create_room(request: RoomCreateRequest):
-    token_data = decode_access_token(
-        token=request.access_token
-    )
-
+async def create_room(
+        request: RoomCreateRequest,
+        principal: TokenPrincipal = Depends(get_principal),
+        session: AsyncSession = Depends(get_db_session)
+):
     new_room = await RoomService.create_room(
         room_init_data=request.data,
-        user_id=token_data.get("user_id")
+        user_id=principal.user_id,
+        session=session
     )
 
     return new_room
 
 
 @router.patch(path="/update")
-async def update_room(request: RoomUpdateRequest):
-    token_data = decode_access_token(
-        token=request.access_token
-    )
-
+async def update_room(
+        request: RoomUpdateRequest,
+        principal: TokenPrincipal = Depends(get_principal),
+        redis_client = Depends(get_redis_client),
+        session: AsyncSession = Depends(get_db_session)
+):
     room_uuid = request.room_uuid
 
     existing_room = await RoomService.get_by_room_uuid(
         room_uuid=room_uuid,
-        owner_id=token_data.get("user_id")
+        owner_id=principal.user_id,
+        session=session
     )
 
     if not existing_room: return "not room"
 
-    if existing_room.owner_id != token_data.get("user_id"): return "permission"
+    if existing_room.owner_id != principal.user_id: return "permission"
 
     is_updated = await RoomService.update_room_settings(
         room_uuid=room_uuid,
-        update_data=request.update_data
+        update_data=request.update_data,
+        redis_client=redis_client,
+        session=session
     )
 
     return is_updated
@@ -64,22 +73,21 @@ async def update_room(request: RoomUpdateRequest):
 @router.post(path="/invite_link", response_class=JSONResponse, response_model=RoomInviteLinkResponse)
 async def get_invite_link(
         request: RoomInviteLinkRequest,
-        redis_client = Depends(get_redis_client)
+        principal: TokenPrincipal = Depends(get_principal),
+        redis_client = Depends(get_redis_client),
+        session: AsyncSession = Depends(get_db_session)
 ) -> str | RoomInviteLinkResponse:
-    token_data = decode_access_token(
-        token=request.access_token
-    )
-
     room_uuid = request.room_uuid
 
     existing_room = await RoomService.get_by_room_uuid(
         room_uuid=room_uuid,
-        owner_id=token_data.get("user_id")
+        owner_id=principal.user_id,
+        session=session
     )
 
     if not existing_room: return "not room"
 
-    if existing_room.owner_id != token_data.get("user_id"): return "permission"
+    if existing_room.owner_id != principal.user_id: return "permission"
 
     invite_link, room_password, permissions = await RoomService.save_room_link(
         redis_client=redis_client,
@@ -97,15 +105,9 @@ async def get_invite_link(
 async def connecting_room(
         invite_link: str,
         request: RoomConnectingRequest,
+        principal: TokenPrincipal = Depends(get_principal),
         redis_client = Depends(get_redis_client)
 ) -> Optional[str]:
-    token_data = decode_access_token(
-        token=request.access_token
-    )
-
-    if not token_data.get("user_id"): 
-        return JSONResponse({"error": "permission"}, status_code=403)
-
     stored_value = await redis_client.get_value(invite_link)
     if not stored_value:
         return JSONResponse({"error": "invalid link"}, status_code=404)
@@ -121,7 +123,7 @@ async def connecting_room(
 
     await RoomService.set_invited_user(
         redis_client=redis_client,
-        invited_user_id=token_data.get("user_id"),
+        invited_user_id=principal.user_id,
         room_uuid=room_uuid,
         permissions=permissions
     )
@@ -133,35 +135,51 @@ async def connecting_room(
 
 
 @router.get("/info/{room_uuid}")
-async def get_room_info(room_uuid: str, access_token: str):
-    token_data = decode_access_token(
-        token=access_token
+async def get_room_info(
+        room_uuid: str,
+        request: Request,
+        response: Response,
+        principal: TokenPrincipal = Depends(get_principal),
+        session: AsyncSession = Depends(get_db_session)
+):
+    user_id = principal.user_id
+
+    updated_at = await RoomService.get_room_version(
+        room_uuid=room_uuid,
+        owner_id=user_id,
+        session=session
     )
 
-    if not token_data: return 401
+    if not updated_at: return None
+
+    etag = make_etag("room", room_uuid, user_id, updated_at.isoformat())
+    headers = validator_headers(etag, updated_at)
 
-    user_id = token_data.get("user_id")
+    if is_not_modified(request, etag, updated_at): return not_modified(headers)
 
-    response = await RoomService.get_by_room_uuid(
+    room = await RoomService.get_by_room_uuid(
         room_uuid=room_uuid,
-        owner_id=user_id
+        owner_id=user_id,
+        session=session
     )
 
-    return response
+    response.headers.update(headers)
+    return room
 
 
 @router.get("/my")
-async def get_my_rooms(access_token: str):
-    token_data = decode_access_token(
-        token=access_token
-    )
-
-    if not token_data: return 401
-
-    user_id = token_data.get("user_id")
+async def get_my_rooms(
+        principal: TokenPrincipal = Depends(get_principal),
+        page: PageParams = Depends(),
+        session: AsyncSession = Depends(get_db_session)
+):
+    user_id = principal.user_id
 
     response = await RoomService.get_all_by_owner(
-        owner_id=user_id
+        owner_id=user_id,
+        limit=page.limit,
+        after=page.after("updated"),
+        session=session
     )
 
     return response
@@ -181,18 +199,17 @@ async def check_access(
 @router.delete(path="/invited")
 async def check_access(
         request: RoomRemoveInvited,
-        redis_client = Depends(get_redis_client)
+        principal: TokenPrincipal = Depends(get_principal),
+        redis_client = Depends(get_redis_client),
+        session: AsyncSession = Depends(get_db_session)
 ):
     print(request)
-    token_data = decode_access_token(
-        token=request.access_token
-    )
-
     room_uuid = request.room_uuid
 
     existing_room = await RoomService.get_by_room_uuid(
         room_uuid=room_uuid,
-        owner_id=token_data.get("user_id")
+        owner_id=principal.user_id,
+        session=session
     )
 
     if not existing_room: return "not room"
@@ -200,7 +217,8 @@ async def check_access(
     user_id = await RoomService.delete_invited_user(
         redis_client=redis_client,
         username=request.username,
-        room_uuid=request.room_uuid
+        room_uuid=request.room_uuid,
+        session=session
     )
     
     await collaboration.disconnect_user(room_uuid, user_id)
@@ -1,8 +1,11 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
 
-from models.api.token import TokenPayload
+from database.core import get_db_session
+from models.api.token import TokenPayload, TokenPrincipal
 from services.core.star_service import StarService
-from utils.jwt_manager import decode_access_token
+from services.redis_client import get_redis_client
+from utils.auth import get_principal
 
 router = APIRouter(
     prefix="/star",
@@ -11,28 +14,36 @@ router = APIRouter(
 
 
 @router.delete(path="/{template_name}")
-async def remove_star(template_name: str, request: TokenPayload):
-    token_data = decode_access_token(
-        token=request.access_token
-    )
-
+async def remove_star(
+        template_name: str,
+        request: TokenPayload,
+        principal: TokenPrincipal = Depends(get_principal),
+        redis_client = Depends(get_redis_client),
+        session: AsyncSession = Depends(get_db_session)
+):
     is_updated = await StarService.remove_star(
-        user_id=token_data.get("user_id"),
-        template_name=template_name
+        user_id=principal.user_id,
+        template_name=template_name,
+        redis_client=redis_client,
+        session=session
     )
 
     return is_updated
 
 
 @router.post(path="/{template_name}")
-async def create_star(template_name: str, request: TokenPayload):
-    token_data = decode_access_token(
-        token=request.access_token
-    )
-
+async def create_star(
+        template_name: str,
+        request: TokenPayload,
+        principal: TokenPrincipal = Depends(get_principal),
+        redis_client = Depends(get_redis_client),
+        session: AsyncSession = Depends(get_db_session)
+):
     is_created = await StarService.create_star(
-        user_id=token_data.get("user_id"),
-        template_name=template_name
+        user_id=principal.user_id,
+        template_name=template_name,
+        redis_client=redis_client,
+        session=session
     )
 
     return is_created
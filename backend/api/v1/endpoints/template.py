@@ -1,9 +1,16 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends, Query, Request, Response
+from sqlalchemy.ext.asyncio import AsyncSession
 from starlette.exceptions import HTTPException
 
+from database.core import get_db_session
 from models.api.template import TemplateCreateRequest, TemplateUpdateRequest
+from models.api.token import TokenPrincipal
+from models.core.template import TemplateOrder
 from services.core.template_service import TemplateService
-from utils.jwt_manager import decode_access_token
+from services.redis_client import get_redis_client
+from utils.auth import get_principal
+from utils.http_cache import is_not_modified, make_etag, not_modified, validator_headers
+from utils.pagination import PageParams
 
 
 router = APIRouter(
@@ -13,108 +20,180 @@ router = APIRouter(
 
 
 @router.post(path="/create")
-async def create_template(request: TemplateCreateRequest):
-    token_data = decode_access_token(
-        token=request.access_token
-    )
-
+async def create_template(
+        request: TemplateCreateRequest,
+        principal: TokenPrincipal = Depends(get_principal),
+        redis_client = Depends(get_redis_client),
+        session: AsyncSession = Depends(get_db_session)
+):
     new_template = await TemplateService.create_template(
         template_data=request.data,
-        owner_id=token_data.get("user_id")
+        owner_id=principal.user_id,
+        redis_client=redis_client,
+        session=session
     )
 
     return new_template
 
 
 @router.patch(path="/update")
-async def update_template(request: TemplateUpdateRequest):
-    token_data = decode_access_token(
-        token=request.access_token
-    )
-
-    username = token_data.get("username")
+async def update_template(
+        request: TemplateUpdateRequest,
+        principal: TokenPrincipal = Depends(get_principal),
+        redis_client = Depends(get_redis_client),
+        session: AsyncSession = Depends(get_db_session)
+):
+    username = principal.username
 
     template_name = request.old_template_name
 
     is_exist = await TemplateService.get_by_name(
         owner_name=username,
-        template_name=template_name
+        template_name=template_name,
+        session=session
     )
 
     if not is_exist: return 404
 
     updated_template = await TemplateService.update_template(
         template_name=template_name,
-        owner_id=token_data.get("user_id"),
-        update_data=request.update_data
+        owner_id=principal.user_id,
+        update_data=request.update_data,
+        redis_client=redis_client,
+        session=session
     )
 
     if updated_template: return 200
 
 
 @router.get(path="/owner_template")
-async def get_template_by_name(template_name: str, access_token: str):
-    token_data = decode_access_token(
-        token=access_token
+async def get_template_by_name(
+        template_name: str,
+        request: Request,
+        response: Response,
+        principal: TokenPrincipal = Depends(get_principal),
+        session: AsyncSession = Depends(get_db_session)
+):
+    username = principal.username
+
+    version = await TemplateService.get_owner_template_version(
+        owner_name=username,
+        template_name=template_name,
+        session=session
     )
-    username = token_data.get("username")
+
+    if not version: return HTTPException(status_code=404, detail="Not found")
+
+    updated_at, stars_count = version
+    etag = make_etag("owner_template", username, template_name, updated_at.isoformat(), stars_count)
+    headers = validator_headers(etag)
+
+    if is_not_modified(request, etag): return not_modified(headers)
 
     is_exist = await TemplateService.get_by_name(
         owner_name=username,
-        template_name=template_name
+        template_name=template_name,
+        session=session
     )
 
     if not is_exist: return HTTPException(status_code=404, detail="Not found")
 
+    response.headers.update(headers)
     return is_exist
 
 
 @router.get(path="/public_template")
-async def get_template_by_name(template_name: str, access_token: str):
-    token_data = decode_access_token(
-        token=access_token
+async def get_template_by_name(
+        template_name: str,
+        request: Request,
+        response: Response,
+        principal: TokenPrincipal = Depends(get_principal),
+        redis_client = Depends(get_redis_client),
+        session: AsyncSession = Depends(get_db_session)
+):
+    user_id = principal.user_id
+
+    version = await TemplateService.get_public_template_version(
+        template_name=template_name,
+        user_id=user_id,
+        redis_client=redis_client,
+        session=session
     )
 
-    if not token_data: return 401
+    if not version: return HTTPException(status_code=404, detail="Not found")
+
+    updated_at, stars_count, starred_by_user = version
+    etag = make_etag("public_template", template_name, updated_at.isoformat(), stars_count, starred_by_user)
+    headers = validator_headers(etag)
+
+    if is_not_modified(request, etag): return not_modified(headers)
 
     is_exist = await TemplateService.get_public_template_info(
         template_name=template_name,
-        user_id=token_data.get("user_id")
-
+        user_id=user_id,
+        redis_client=redis_client,
+        session=session
     )
 
     if not is_exist: return HTTPException(status_code=404, detail="Not found")
 
+    response.headers.update(headers)
     return is_exist
 
 
 @router.get("/public")
-async def get_public_templates(access_token: str):
-    token_data = decode_access_token(
-        token=access_token
-    )
-
-    if not token_data: return 401
-
-    user_id = token_data.get("user_id")
+async def get_public_templates(
+        order: TemplateOrder = TemplateOrder.updated,
+        principal: TokenPrincipal = Depends(get_principal),
+        page: PageParams = Depends(),
+        redis_client = Depends(get_redis_client),
+        session: AsyncSession = Depends(get_db_session)
+):
+    user_id = principal.user_id
 
     response = await TemplateService.get_all_public(
-        user_id=user_id
+        user_id=user_id,
+        order=order,
+        limit=page.limit,
+        after=page.after(order.value),
+        redis_client=redis_client,
+        session=session
     )
 
     return response
 
 
 @router.get("/my")
-async def get_my_templates(access_token: str):
-    token_data = decode_access_token(
-        token=access_token
+async def get_my_templates(
+        principal: TokenPrincipal = Depends(get_principal),
+        page: PageParams = Depends(),
+        session: AsyncSession = Depends(get_db_session)
+):
+    user_id = principal.user_id
+
+    response = await TemplateService.get_all_by_owner(
+        owner_id=user_id,
+        limit=page.limit,
+        after=page.after(TemplateOrder.updated.value),
+        session=session
     )
 
-    if not token_data: return 401
+    return response
 
-    user_id = token_data.get("user_id")
 
-    response = await TemplateService.get_all_by_owner(owner_id=user_id)
+@router.get("/search")
+async def search_templates(
+        q: str = Query(min_length=1, max_length=256),
+        principal: TokenPrincipal = Depends(get_principal),
+        page: PageParams = Depends(),
+        session: AsyncSession = Depends(get_db_session)
+):
+    response = await TemplateService.search(
+        query_text=q,
+        user_id=principal.user_id,
+        limit=page.limit,
+        after=page.after("rank"),
+        session=session
+    )
 
     return response
@@ -1,7 +1,11 @@
-from fastapi import APIRouter
+from fastapi import APIRouter, Depends
+from sqlalchemy.ext.asyncio import AsyncSession
+from database.core import get_db_session
+from models.api.token import TokenPrincipal
 from models.api.user import UserUpdateRequest
 from services.core.user_service import UserService
-from utils.jwt_manager import decode_access_token
+from services.redis_client import get_redis_client
+from utils.auth import get_principal
 
 router = APIRouter(
     prefix="/user",
@@ -10,27 +14,32 @@ router = APIRouter(
 
 
 @router.patch(path="/update")
-async def update_user(request: UserUpdateRequest):
-    token_data = decode_access_token(
-        token=request.access_token
-    )
-
+async def update_user(
+        request: UserUpdateRequest,
+        principal: TokenPrincipal = Depends(get_principal),
+        redis_client = Depends(get_redis_client),
+        session: AsyncSession = Depends(get_db_session)
+):
     is_updated = await UserService.update_user(
-        user_id=token_data.get("user_id"),
-        update_data=request.update_data
+        user_id=principal.user_id,
+        update_data=request.update_data,
+        redis_client=redis_client,
+        session=session
     )
 
     return is_updated
 
 
 @router.get(path="/profile_info")
-async def get_profile_info(access_token: str):
-    token_data = decode_access_token(
-        token=access_token
-    )
-
+async def get_profile_info(
+        principal: TokenPrincipal = Depends(get_principal),
+        redis_client = Depends(get_redis_client),
+        session: AsyncSession = Depends(get_db_session)
+):
     user = await UserService.get_user(
-        user_id=token_data.get("user_id"),
+        user_id=principal.user_id,
+        redis_client=redis_client,
+        session=session
     )
 
     return user
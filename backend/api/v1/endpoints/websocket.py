@@ -1,8 +1,8 @@
 from fastapi import APIRouter
 from starlette import status
-from starlette.websockets import WebSocket, WebSocketDisconnect
+from starlette.websockets import WebSocket
 
-from services.collaboration import Collaboration
+from services.collaboration import Collaboration, collaboration
 from services.connection_client import ConnectionManager
 from services.redis_client import AsyncRedisClient
 
@@ -12,8 +12,6 @@ router = APIRouter(
     tags=["ws"]
 )
 
-collaboration = Collaboration()
-
 
 @router.websocket("/collaborate")
 async def websocket_endpoint(websocket: WebSocket, access_token: str, room_uuid: str):
@@ -36,21 +34,22 @@ async def websocket_endpoint(websocket: WebSocket, access_token: str, room_uuid:
             return
 
         room_id = access_data["room_id"]
-        await collaboration.connect(room_id, websocket, user_id)
+        await collaboration.connect(room_id, websocket, user_id, access_data.get("permissions"))
 
         while True:
             try:
-                data = await websocket.receive_bytes()
-                await collaboration.broadcast(room_id, data, websocket)
-            except RuntimeError:
-                try:
-                    data = await websocket.receive_text()
-                    await collaboration.broadcast(room_id, data.encode('utf-8'), websocket)
-                except RuntimeError as e:
-                    print(f"Unsupported message format: {e}")
-                    continue
-            except WebSocketDisconnect:
-                break
+                message = await websocket.receive()
+                if message["type"] == "websocket.disconnect":
+                    break
+
+                data = message.get("bytes")
+                if data is None:
+                    text = message.get("text")
+                    if text is None:
+                        continue
+                    data = text.encode("utf-8")
+
+                await collaboration.handle_message(room_id, data, websocket)
             except Exception as e:
                 print(f"WebSocket error: {e}")
                 break
@@ -6,6 +6,7 @@ from api.v1.endpoints.room import router as room_router
 from api.v1.endpoints.template import router as template_router
 from api.v1.endpoints.star import router as star_router
 from api.v1.endpoints.convertor import router as convertor_router
+from api.v1.endpoints.metrics import router as metrics_router
 
 
 router = APIRouter(
@@ -19,3 +20,4 @@ router.include_router(room_router)
 router.include_router(template_router)
 router.include_router(star_router)
 router.include_router(convertor_router)
+router.include_router(metrics_router)
@@ -0,0 +1,72 @@
+import argparse
+import asyncio
+import json
+from time import perf_counter
+
+from benchmarks.helpers import CountingSocket
+from services.collaboration import Collaboration
+from utils.yprotocol import MESSAGE_AWARENESS, encode_awareness
+
+
+def cursor_frame(client_id: int, clock: int) -> bytes:
+    state = json.dumps({
+        "user": {"name": f"user-{client_id}", "color": "#30bced"},
+        "cursor": {"anchor": clock % 500, "head": clock % 500}
+    }).encode()
+    return encode_awareness([(client_id, clock, state)])
+
+
+async def move_cursor(collaboration: Collaboration, socket, client_id: int, rate: int, duration: float):
+    interval = 1 / rate
+    started = perf_counter()
+    for clock in range(1, int(rate * duration) + 1):
+        await collaboration.handle_message("bench", cursor_frame(client_id, clock), socket)
+        delay = started + clock * interval - perf_counter()
+        await asyncio.sleep(max(delay, 0))
+
+
+async def measure(interval_ms: float, clients: int, rate: int, duration: float):
+    collaboration = Collaboration(persistent=False)
+    collaboration.awareness_interval = interval_ms / 1000
+
+    sockets = [CountingSocket(lambda parsed: parsed.message_type == MESSAGE_AWARENESS) for _ in range(clients)]
+    for index, socket in enumerate(sockets):
+        await collaboration.connect("bench", socket, f"user-{index}")
+
+    started = perf_counter()
+    await asyncio.gather(*(
+        move_cursor(collaboration, socket, index + 1, rate, duration)
+        for index, socket in enumerate(sockets)
+    ))
+    await collaboration.flush_awareness("bench")
+    await asyncio.sleep(0.05)
+    elapsed = perf_counter() - started
+
+    for socket in sockets:
+        collaboration.disconnect("bench", socket)
+    await asyncio.sleep(0)
+
+    frames = sum(socket.frames for socket in sockets)
+    sent = sum(socket.bytes for socket in sockets)
+    print(
+        f"interval={interval_ms:5.1f}ms clients={clients:<4} "
+        f"frames/s/peer={frames / clients / elapsed:8.1f} "
+        f"KiB/s/peer={sent / clients / elapsed / 1024:8.1f} "
+        f"KiB/s/room={sent / elapsed / 1024:9.1f}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Awareness bandwidth per peer with and without throttling")
+    parser.add_argument("--intervals", type=float, nargs="+", default=[0, 50, 100, 250])
+    parser.add_argument("--clients", type=int, default=50)
+    parser.add_argument("--rate", type=int, default=30)
+    parser.add_argument("--duration", type=float, default=2.0)
+    args = parser.parse_args()
+
+    for interval in args.intervals:
+        await measure(interval, args.clients, args.rate, args.duration)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
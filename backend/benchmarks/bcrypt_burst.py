@@ -0,0 +1,75 @@
+import argparse
+import asyncio
+import statistics
+from time import perf_counter
+
+import bcrypt
+
+from benchmarks.helpers import LatencySocket
+from services.collaboration import Collaboration
+from utils.hash_manager import check_password, hash_metrics, shutdown_hash_executor
+
+
+async def inline_check_password(password: str, hashed_password: bytes) -> bool:
+    return bcrypt.checkpw(password.encode(), hashed_password)
+
+
+async def ticker(collaboration: Collaboration, sender, interval: float, stop: asyncio.Event):
+    while not stop.is_set():
+        scheduled = perf_counter()
+        await asyncio.sleep(interval)
+        await collaboration.broadcast("bench", str(scheduled + interval).encode(), sender)
+
+
+async def run(check, logins: int, peers: int, interval: float, hashed: bytes) -> list:
+    collaboration = Collaboration(persistent=False)
+    sender = LatencySocket()
+    sockets = [LatencySocket() for _ in range(peers)]
+
+    await collaboration.connect("bench", sender, "sender")
+    for index, socket in enumerate(sockets):
+        await collaboration.connect("bench", socket, f"peer-{index}")
+
+    stop = asyncio.Event()
+    ticks = asyncio.create_task(ticker(collaboration, sender, interval, stop))
+
+    await asyncio.sleep(interval * 5)
+    await asyncio.gather(*(check("password", hashed) for _ in range(logins)))
+    await asyncio.sleep(interval * 5)
+
+    stop.set()
+    await ticks
+
+    return [latency for socket in sockets for latency in socket.latencies]
+
+
+def report(name: str, latencies: list):
+    latencies = sorted(latencies)
+    p99 = latencies[int(len(latencies) * 0.99) - 1]
+    print(
+        f"{name:<10} samples={len(latencies):<6} "
+        f"p50={statistics.median(latencies) * 1000:8.2f}ms "
+        f"p99={p99 * 1000:8.2f}ms "
+        f"max={latencies[-1] * 1000:8.2f}ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Broadcast latency during a login burst")
+    parser.add_argument("--logins", type=int, default=32)
+    parser.add_argument("--peers", type=int, default=20)
+    parser.add_argument("--interval", type=float, default=0.01)
+    parser.add_argument("--rounds", type=int, default=12)
+    args = parser.parse_args()
+
+    hashed = bcrypt.hashpw(b"password", bcrypt.gensalt(rounds=args.rounds))
+
+    report("inline", await run(inline_check_password, args.logins, args.peers, args.interval, hashed))
+    report("offloaded", await run(check_password, args.logins, args.peers, args.interval, hashed))
+    print(hash_metrics.snapshot())
+
+    shutdown_hash_executor()
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,76 @@
+import argparse
+import asyncio
+from time import perf_counter
+
+from benchmarks.helpers import CountingSocket, build_keystrokes
+from services.collaboration import Collaboration
+from utils.yprotocol import MESSAGE_SYNC, SYNC_UPDATE, YMessage
+
+
+def is_update(parsed: YMessage) -> bool:
+    return parsed.message_type == MESSAGE_SYNC and parsed.sync_type == SYNC_UPDATE
+
+
+async def type_into(collaboration: Collaboration, socket, frames: list, rate: int):
+    interval = 1 / rate
+    started = perf_counter()
+    for index, frame in enumerate(frames):
+        await collaboration.handle_message("bench", frame, socket)
+        delay = started + (index + 1) * interval - perf_counter()
+        await asyncio.sleep(max(delay, 0))
+
+
+async def measure(window_ms: float, max_delay_ms: float, writers: int, viewers: int, rate: int, duration: float):
+    collaboration = Collaboration(persistent=False)
+    collaboration.coalescer.window = window_ms / 1000
+    collaboration.coalescer.max_delay = max_delay_ms / 1000
+
+    typists = [CountingSocket(is_update) for _ in range(writers)]
+    watchers = [CountingSocket(is_update) for _ in range(viewers)]
+    for index, socket in enumerate(typists + watchers):
+        await collaboration.connect("bench", socket, f"user-{index}")
+
+    keystrokes = int(rate * duration)
+    histories = [build_keystrokes(keystrokes, index + 1) for index in range(writers)]
+
+    started = perf_counter()
+    await asyncio.gather(*(
+        type_into(collaboration, socket, frames, rate)
+        for socket, frames in zip(typists, histories)
+    ))
+    await collaboration.coalescer.close()
+    await asyncio.sleep(0.05)
+    elapsed = perf_counter() - started
+
+    for socket in typists + watchers:
+        collaboration.disconnect("bench", socket)
+    await asyncio.sleep(0)
+
+    frames = sum(socket.frames for socket in watchers)
+    sent = sum(socket.bytes for socket in watchers)
+    stats = collaboration.coalescer.snapshot()
+    print(
+        f"window={window_ms:5.1f}ms max_delay={max_delay_ms:5.1f}ms "
+        f"updates_in={writers * keystrokes:<6} "
+        f"frames/s/viewer={frames / viewers / elapsed:8.1f} "
+        f"KiB/s/viewer={sent / viewers / elapsed / 1024:7.1f} "
+        f"merge_ratio={stats['ratio']:5.1f}"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Broadcast frame rate with and without update coalescing")
+    parser.add_argument("--windows", type=float, nargs="+", default=[0, 5, 20])
+    parser.add_argument("--max-delay", type=float, default=50)
+    parser.add_argument("--writers", type=int, default=4)
+    parser.add_argument("--viewers", type=int, default=50)
+    parser.add_argument("--rate", type=int, default=200)
+    parser.add_argument("--duration", type=float, default=2.0)
+    args = parser.parse_args()
+
+    for window in args.windows:
+        await measure(window, args.max_delay, args.writers, args.viewers, args.rate, args.duration)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
@@ -0,0 +1,56 @@
+import argparse
+import asyncio
+from time import perf_counter
+
+from pycrdt import Doc, Text
+
+from benchmarks.helpers import RecordingSocket, build_history
+from services.collaboration import Collaboration
+from utils.yprotocol import SYNC_STEP2, encode_sync_step1, parse_message
+
+
+async def measure(edits: int):
+    frames = build_history(edits)
+    collaboration = Collaboration(persistent=False)
+    editor = RecordingSocket()
+    await collaboration.connect("bench", editor, "editor")
+    for frame in frames:
+        await collaboration.handle_message("bench", frame, editor)
+
+    joiner = RecordingSocket()
+    await collaboration.connect("bench", joiner, "joiner")
+
+    client = Doc()
+    started = perf_counter()
+    await collaboration.handle_message("bench", encode_sync_step1(client.get_state()), joiner)
+    step2 = await joiner.wait_for(SYNC_STEP2)
+    client.apply_update(bytes(parse_message(step2).payload))
+    first_sync = perf_counter() - started
+
+    replay = Doc()
+    started = perf_counter()
+    for frame in frames:
+        replay.apply_update(bytes(parse_message(frame).payload))
+    replayed = perf_counter() - started
+
+    assert str(client.get("shared-text", type=Text)) == str(replay.get("shared-text", type=Text))
+
+    print(
+        f"edits={edits:<7} history={sum(map(len, frames)) / 1024:9.1f}KiB "
+        f"step2={len(step2) / 1024:8.1f}KiB "
+        f"first_sync={first_sync * 1000:8.2f}ms "
+        f"replay={replayed * 1000:8.2f}ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Time-to-first-sync for rooms with large histories")
+    parser.add_argument("--edits", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    args = parser.parse_args()
+
+    for edits in args.edits:
+        await measure(edits)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
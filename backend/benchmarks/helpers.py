@@ -0,0 +1,89 @@
+import asyncio
+from time import perf_counter
+from typing import Callable, List, Optional, Tuple
+
+from pycrdt import Doc, Text
+from starlette.websockets import WebSocket, WebSocketState
+
+from utils.yprotocol import YMessage, encode_update, parse_message
+
+
+class CountingSocket:
+    def __init__(self, accept: Callable[[YMessage], bool] = lambda parsed: True):
+        self.accept = accept
+        self.frames = 0
+        self.bytes = 0
+
+    async def send_bytes(self, message: bytes):
+        if self.accept(parse_message(message)):
+            self.frames += 1
+            self.bytes += len(message)
+
+
+class RecordingSocket:
+    def __init__(self):
+        self.frames = asyncio.Queue()
+
+    async def send_bytes(self, message: bytes):
+        self.frames.put_nowait(message)
+
+    async def wait_for(self, sync_type: int) -> bytes:
+        while True:
+            frame = await self.frames.get()
+            if parse_message(frame).sync_type == sync_type:
+                return frame
+
+
+class LatencySocket:
+    def __init__(self):
+        self.latencies = []
+
+    async def send_bytes(self, message: bytes):
+        if message[:1] == b"\x00":
+            return
+        self.latencies.append(perf_counter() - float(message.decode()))
+
+
+class NullTransport:
+    def __init__(self):
+        self.sent = 0
+
+    async def receive(self):
+        await asyncio.Event().wait()
+
+    async def send(self, message: dict):
+        self.sent += 1
+
+
+def make_socket(transport: NullTransport) -> WebSocket:
+    websocket = WebSocket(
+        scope={"type": "websocket", "path": "/ws/collaborate", "headers": [], "query_string": b""},
+        receive=transport.receive,
+        send=transport.send
+    )
+    websocket.client_state = WebSocketState.CONNECTED
+    websocket.application_state = WebSocketState.CONNECTED
+    return websocket
+
+
+def build_document(edits: int, client_id: Optional[int] = None, delete_every: int = 0) -> Tuple[Doc, Text, List[bytes]]:
+    doc = Doc() if client_id is None else Doc(client_id=client_id)
+    text = doc.get("shared-text", type=Text)
+    frames = []
+    doc.observe(lambda event: frames.append(encode_update(event.update)))
+
+    for index in range(edits):
+        if delete_every and index % delete_every == delete_every - 1:
+            del text[len(text) - 1]
+        else:
+            text.insert(len(text), chr(97 + index % 26))
+
+    return doc, text, frames
+
+
+def build_keystrokes(count: int, client_id: Optional[int] = None) -> List[bytes]:
+    return build_document(count, client_id)[2]
+
+
+def build_history(edits: int) -> List[bytes]:
+    return build_document(edits, delete_every=5)[2]
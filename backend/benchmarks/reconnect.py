@@ -0,0 +1,69 @@
+import argparse
+import asyncio
+
+from pycrdt import Doc
+
+from benchmarks.helpers import CountingSocket, build_document
+from services.collaboration import Collaboration
+from utils.yprotocol import MESSAGE_SYNC, SYNC_STEP1, YMessage, encode_sync_step1, encode_sync_step2
+
+
+def is_catch_up(parsed: YMessage) -> bool:
+    return parsed.message_type == MESSAGE_SYNC and parsed.sync_type != SYNC_STEP1
+
+
+async def measure(edits: int, peers: int, missed: int):
+    doc, text, frames = build_document(edits, delete_every=5)
+    collaboration = Collaboration(persistent=False)
+
+    watchers = [CountingSocket(is_catch_up) for _ in range(peers)]
+    for index, socket in enumerate(watchers):
+        await collaboration.connect("bench", socket, f"user-{index}")
+    for frame in frames:
+        await collaboration.handle_message("bench", frame, watchers[0])
+
+    client = Doc()
+    client.apply_update(doc.get_update())
+
+    frames.clear()
+    for index in range(missed):
+        text.insert(index, "y")
+    for frame in frames:
+        await collaboration.handle_message("bench", frame, watchers[0])
+    await asyncio.sleep(0.01)
+
+    before = sum(socket.bytes for socket in watchers)
+    reconnecting = CountingSocket(is_catch_up)
+    await collaboration.connect("bench", reconnecting, "mobile")
+    await collaboration.handle_message("bench", encode_sync_step1(client.get_state()), reconnecting)
+    step2 = encode_sync_step2(client.get_update(collaboration.documents["bench"].get_state()))
+    await collaboration.handle_message("bench", step2, reconnecting)
+    await asyncio.sleep(0.01)
+    fanned_out = sum(socket.bytes for socket in watchers) - before
+
+    for socket in watchers + [reconnecting]:
+        collaboration.disconnect("bench", socket)
+    await asyncio.sleep(0)
+
+    print(
+        f"edits={edits:<7} missed={missed:<4} "
+        f"catch_up={reconnecting.bytes / 1024:7.1f}KiB "
+        f"client_step2={len(step2) / 1024:7.1f}KiB "
+        f"fanned_out={fanned_out / 1024:7.1f}KiB "
+        f"fanned_out_before={len(step2) * (peers - 1) / 1024:8.1f}KiB"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Bytes exchanged when a client reconnects after missing a few edits")
+    parser.add_argument("--edits", type=int, nargs="+", default=[1_000, 10_000, 50_000])
+    parser.add_argument("--peers", type=int, default=20)
+    parser.add_argument("--missed", type=int, default=20)
+    args = parser.parse_args()
+
+    for edits in args.edits:
+        await measure(edits, args.peers, args.missed)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
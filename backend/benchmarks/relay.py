@@ -0,0 +1,58 @@
+import argparse
+import asyncio
+from time import perf_counter, process_time
+
+from benchmarks.helpers import NullTransport, build_keystrokes, make_socket
+from services.collaboration import Collaboration
+
+
+async def measure(peers: int, messages: int, read_only: bool):
+    collaboration = Collaboration(persistent=False)
+    transports = [NullTransport() for _ in range(peers)]
+    sockets = [make_socket(transport) for transport in transports]
+    for index, websocket in enumerate(sockets):
+        permissions = "read_only" if read_only and index else "read_write"
+        await collaboration.connect("bench", websocket, f"user-{index}", permissions)
+    await asyncio.sleep(0)
+
+    frames = build_keystrokes(messages)
+    sender = sockets[0]
+    sent_before = sum(transport.sent for transport in transports)
+
+    wall, cpu = perf_counter(), process_time()
+    for frame in frames:
+        await collaboration.handle_message("bench", frame, sender)
+        await asyncio.sleep(0)
+    group = collaboration.viewers.get("bench")
+    while (group is not None and group.depth) or any(
+            collaboration.rooms["bench"][websocket].queue.depth for websocket in sockets
+    ):
+        await asyncio.sleep(0)
+    wall, cpu = perf_counter() - wall, process_time() - cpu
+
+    delivered = sum(transport.sent for transport in transports) - sent_before
+    for websocket in sockets:
+        collaboration.disconnect("bench", websocket)
+    await asyncio.sleep(0)
+
+    print(
+        f"peers={peers:<5} viewers={'yes' if read_only else 'no':<4} messages={messages:<6} "
+        f"msgs/s/core={messages / cpu:9.0f} "
+        f"deliveries/s/core={delivered / cpu:10.0f} "
+        f"wall={wall * 1000:8.1f}ms"
+    )
+
+
+async def main():
+    parser = argparse.ArgumentParser(description="Relay throughput of the collaboration message path")
+    parser.add_argument("--peers", type=int, nargs="+", default=[2, 10, 100])
+    parser.add_argument("--messages", type=int, default=5_000)
+    parser.add_argument("--read-only", action="store_true", help="connect every peer except the sender as a viewer")
+    args = parser.parse_args()
+
+    for peers in args.peers:
+        await measure(peers, args.messages, args.read_only)
+
+
+if __name__ == "__main__":
+    asyncio.run(main())
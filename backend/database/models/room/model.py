@@ -1,4 +1,5 @@
-from sqlalchemy import ForeignKey
+from typing import Optional
+from sqlalchemy import ForeignKey, Index, LargeBinary
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from database.core import Base
 from utils.mixins.timestamp import TimestampMixin
@@ -6,11 +7,15 @@ from utils.mixins.timestamp import TimestampMixin
 
 class Room(Base, TimestampMixin):
     __tablename__ = "rooms"
+    __table_args__ = (
+        Index("ix_rooms_owner_id_updated_at_id", "owner_id", "updated_at", "id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(unique=False, nullable=False)
     room_uuid: Mapped[str] = mapped_column(unique=True, nullable=False)
     content: Mapped[str] = mapped_column(nullable=True)
+    snapshot: Mapped[Optional[bytes]] = mapped_column(LargeBinary, nullable=True, deferred=True)
 
     owner_id: Mapped[int] = mapped_column(ForeignKey(
         column="users.id",
@@ -1,4 +1,5 @@
-from typing import List, Optional
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
 
 from sqlalchemy import update, select
 from sqlalchemy.ext.asyncio import AsyncSession
@@ -10,6 +11,7 @@ from models.core.room import (
     RoomUpdate
 )
 from utils.base_repository import BaseRepository
+from utils.pagination import Page
 
 
 class RoomRepository(BaseRepository[Room, RoomRead]):
@@ -35,7 +37,6 @@ class RoomRepository(BaseRepository[Room, RoomRead]):
             .returning(self.model)
         )
         result = await self.session.execute(stmt)
-        await self.session.commit()
         record = result.scalar_one_or_none()
         return RoomRead.model_validate(record) if record else None
 
@@ -51,6 +52,50 @@ class RoomRepository(BaseRepository[Room, RoomRead]):
         room = result.scalar_one_or_none()
         return RoomRead.model_validate(room) if room else None
 
+    async def get_room_version(self, room_uuid: str, owner_id: int) -> Optional[datetime]:
+        result = await self.session.execute(
+            select(self.model.updated_at)
+            .where(
+                (self.model.room_uuid == room_uuid) &
+                (self.model.owner_id == owner_id)
+            )
+        )
+
+        return result.scalar_one_or_none()
+
+    async def get_owner_id(self, room_uuid: str) -> Optional[int]:
+        result = await self.session.execute(
+            select(self.model.owner_id)
+            .where(self.model.room_uuid == room_uuid)
+        )
+
+        return result.scalar_one_or_none()
+
+    async def get_document_state(self, room_uuid: str) -> Optional[Tuple[int, Optional[bytes]]]:
+        result = await self.session.execute(
+            select(self.model.id, self.model.snapshot)
+            .where(self.model.room_uuid == room_uuid)
+            .with_for_update(read=True)
+        )
+
+        state = result.first()
+        return tuple(state) if state else None
+
+    async def lock_snapshot(self, room_id: int) -> Optional[bytes]:
+        result = await self.session.execute(
+            select(self.model.snapshot)
+            .where(self.model.id == room_id)
+            .with_for_update()
+        )
+        return result.scalar_one_or_none()
+
+    async def save_snapshot(self, room_id: int, snapshot: bytes, content: str):
+        await self.session.execute(
+            update(self.model)
+            .where(self.model.id == room_id)
+            .values(snapshot=snapshot, content=content)
+        )
+
     async def get_by_room_info(self, room_uuid: str) -> Optional[RoomRead]:
         result = await self.session.execute(
             select(self.model)
@@ -62,21 +107,30 @@ class RoomRepository(BaseRepository[Room, RoomRead]):
 
     async def get_all_by_owner(
             self,
-            owner_id: int
-    ) -> Optional[List[RoomInfo]]:
-
-        result = await self.session.execute(
-            select(self.model)
-            .where(self.model.owner_id == owner_id)
-            .group_by(self.model.id)
+            owner_id: int,
+            limit: int,
+            after: Optional[List[Any]] = None
+    ) -> Page[RoomInfo]:
+        rows, next_cursor = await self.paginate(
+            query=self.select(
+                self.model.id,
+                self.model.name,
+                self.model.room_uuid,
+                self.model.updated_at
+            ).where(self.model.owner_id == owner_id),
+            order_by=(self.model.updated_at, self.model.id),
+            order="updated",
+            limit=limit,
+            after=after
         )
 
-        rooms = result.scalars().all()
-        if rooms:
-            return [
+        return Page[RoomInfo](
+            items=[
                 RoomInfo(
                     room_uuid=room.room_uuid,
                     name=room.name,
                 )
-                for room in rooms
-            ]
+                for room, in rows
+            ],
+            next_cursor=next_cursor
+        )
@@ -0,0 +1,24 @@
+from datetime import datetime
+from sqlalchemy import BigInteger, DateTime, ForeignKey, Index, LargeBinary, func
+from sqlalchemy.orm import Mapped, mapped_column
+from database.core import Base
+
+
+class RoomUpdateLog(Base):
+    __tablename__ = "room_updates"
+    __table_args__ = (
+        Index("ix_room_updates_room_id_id", "room_id", "id"),
+    )
+
+    id: Mapped[int] = mapped_column(BigInteger, primary_key=True, autoincrement=True)
+    room_id: Mapped[int] = mapped_column(ForeignKey(
+        column="rooms.id",
+        ondelete="CASCADE"),
+        nullable=False
+    )
+    data: Mapped[bytes] = mapped_column(LargeBinary, nullable=False)
+    created_at: Mapped[datetime] = mapped_column(
+        DateTime(timezone=True),
+        nullable=False,
+        server_default=func.now()
+    )
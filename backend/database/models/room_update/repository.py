@@ -0,0 +1,52 @@
+from datetime import datetime
+from typing import List, Sequence, Tuple
+
+from sqlalchemy import delete, func, insert, or_, select
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.models.room_update.model import RoomUpdateLog
+from models.core.room import RoomUpdateLogRead
+from utils.base_repository import BaseRepository
+
+
+class RoomUpdateLogRepository(BaseRepository[RoomUpdateLog, RoomUpdateLogRead]):
+    def __init__(self, session: AsyncSession):
+        super().__init__(session, RoomUpdateLog)
+
+    async def append_updates(self, entries: Sequence[Tuple[int, bytes]]):
+        await self.session.execute(
+            insert(self.model),
+            [{"room_id": room_id, "data": data} for room_id, data in entries]
+        )
+
+    async def get_updates(self, room_id: int) -> List[Tuple[int, bytes]]:
+        result = await self.session.execute(
+            select(self.model.id, self.model.data)
+            .where(self.model.room_id == room_id)
+            .order_by(self.model.id)
+        )
+        return [tuple(row) for row in result.all()]
+
+    async def delete_updates(self, update_ids: Sequence[int]) -> int:
+        result = await self.session.execute(
+            delete(self.model)
+            .where(self.model.id.in_(update_ids))
+        )
+        return result.rowcount
+
+    async def get_rooms_to_compact(
+            self,
+            min_updates: int,
+            older_than: datetime,
+            limit: int
+    ) -> List[int]:
+        result = await self.session.execute(
+            select(self.model.room_id)
+            .group_by(self.model.room_id)
+            .having(or_(
+                func.count() >= min_updates,
+                func.min(self.model.created_at) < older_than
+            ))
+            .limit(limit)
+        )
+        return list(result.scalars().all())
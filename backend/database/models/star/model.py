@@ -1,4 +1,4 @@
-from sqlalchemy import ForeignKey, UniqueConstraint
+from sqlalchemy import ForeignKey, Index, UniqueConstraint
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from database.core import Base
 from utils.mixins.timestamp import TimestampMixin
@@ -6,7 +6,10 @@ from utils.mixins.timestamp import TimestampMixin
 
 class Star(Base, TimestampMixin):
     __tablename__ = "stars"
-    __table_args__ = (UniqueConstraint("user_id", "template_id", name="unique_star"),)
+    __table_args__ = (
+        UniqueConstraint("user_id", "template_id", name="unique_star"),
+        Index("ix_stars_template_id", "template_id"),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
 
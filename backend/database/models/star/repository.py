@@ -1,4 +1,6 @@
-from sqlalchemy import delete, select
+from typing import List
+
+from sqlalchemy import delete, select, update
 from sqlalchemy.ext.asyncio import AsyncSession
 from database.models.star.model import Star
 from database.models.template.model import Template
@@ -19,6 +21,23 @@ class StarRepository(BaseRepository[Star, StarRead]):
             raise ValueError(f"Template with name '{template_name}' not found")
         return template_id
 
+    async def _shift_stars_count(self, template_id: int, delta: int):
+        await self.session.execute(
+            update(Template)
+            .where(Template.id == template_id)
+            .values(
+                stars_count=Template.stars_count + delta,
+                updated_at=Template.updated_at
+            )
+        )
+
+    async def get_starred_template_ids(self, user_id: int) -> List[int]:
+        result = await self.session.execute(
+            select(self.model.template_id)
+            .where(self.model.user_id == user_id)
+        )
+        return list(result.scalars().all())
+
     async def create_star(self, template_name: str, user_id: int) -> StarRead:
         template_id = await self._get_template_id(template_name)
 
@@ -31,6 +50,7 @@ class StarRepository(BaseRepository[Star, StarRead]):
             data=star_data,
             returning_model=StarRead
         )
+        await self._shift_stars_count(template_id, 1)
         return db_star
 
     async def remove_star(self, template_name: str, user_id: int) -> bool:
@@ -46,5 +66,8 @@ class StarRepository(BaseRepository[Star, StarRead]):
         )
 
         result = await self.session.execute(stmt)
-        await self.session.commit()
-        return result.scalar_one_or_none() is not None
\ No newline at end of file
+        is_removed = result.scalar_one_or_none() is not None
+
+        if is_removed:
+            await self._shift_stars_count(template_id, -1)
+        return is_removed
\ No newline at end of file
@@ -1,16 +1,40 @@
-from sqlalchemy import ForeignKey
+from sqlalchemy import Column, Computed, ForeignKey, Index, text
+from sqlalchemy.dialects.postgresql import TSVECTOR
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from database.core import Base
 from utils.mixins.timestamp import TimestampMixin
 
 
+SEARCH_CONFIG = "simple"
+SEARCH_CONTENT_LIMIT = 100000
+
+
 class Template(Base, TimestampMixin):
     __tablename__ = "templates"
+    __table_args__ = (
+        Index("ix_templates_owner_id_name", "owner_id", "name"),
+        Index("ix_templates_name", "name"),
+        Index("ix_templates_owner_id_updated_at_id", "owner_id", "updated_at", "id"),
+        Index("ix_templates_public_updated_at_id", "updated_at", "id", postgresql_where=text("is_public")),
+        Index("ix_templates_public_stars_count_id", "stars_count", "id", postgresql_where=text("is_public")),
+        Index("ix_templates_search_vector", "search_vector", postgresql_using="gin"),
+    )
+    __mapper_args__ = {"exclude_properties": ["search_vector"]}
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     name: Mapped[str] = mapped_column(nullable=False)
     content: Mapped[str] = mapped_column(nullable=False)
     is_public: Mapped[bool] = mapped_column(nullable=False, default=False)
+    stars_count: Mapped[int] = mapped_column(nullable=False, default=0, server_default="0")
+    search_vector = Column(
+        TSVECTOR,
+        Computed(
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', coalesce(name, '')), 'A') || "
+            f"setweight(to_tsvector('{SEARCH_CONFIG}', left(coalesce(content, ''), {SEARCH_CONTENT_LIMIT})), 'B')",
+            persisted=True
+        ),
+        nullable=True
+    )
 
     owner_id: Mapped[int] = mapped_column(ForeignKey(
         column="users.id",
@@ -1,19 +1,49 @@
-from typing import Optional
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
 
 from sqlalchemy import update, select, func, exists
 from sqlalchemy.ext.asyncio import AsyncSession
 
 from database.models.star.model import Star
-from database.models.template.model import Template
+from database.models.template.model import SEARCH_CONFIG, Template
 from database.models.user.model import User
 from models.core.template import (
     TemplateRead,
     TemplateCreate,
     TemplateUpdate,
     AdditOwnerTemplatesInfo,
-    AdditPublicTemplatesInfo, OwnerTemplatesInfo, PublicTemplatesInfo
+    OwnerTemplatesInfo,
+    PublicTemplatesInfo,
+    PublicTemplateDetails,
+    PublicTemplateEntry,
+    TemplateOrder
 )
 from utils.base_repository import BaseRepository
+from utils.pagination import Page
+
+
+LIST_COLUMNS = (
+    Template.id,
+    Template.name,
+    Template.stars_count,
+    Template.updated_at,
+)
+
+TEMPLATE_ORDERINGS = {
+    TemplateOrder.updated: (Template.updated_at, Template.id),
+    TemplateOrder.stars: (Template.stars_count, Template.id),
+}
+
+
+def starred_by_user(user_id: int):
+    return exists(
+        select(1)
+        .where(
+            Star.template_id == Template.id,
+            Star.user_id == user_id
+        )
+        .correlate(Template)
+    ).label('starred_by_user')
 
 
 class TemplateRepository(BaseRepository[Template, TemplateRead]):
@@ -43,7 +73,6 @@ class TemplateRepository(BaseRepository[Template, TemplateRead]):
             .returning(self.model)
         )
         result = await self.session.execute(stmt)
-        await self.session.commit()
         record = result.scalar_one_or_none()
         return TemplateRead.model_validate(record) if record else None
 
@@ -53,136 +82,190 @@ class TemplateRepository(BaseRepository[Template, TemplateRead]):
             owner_name: str
     ) -> Optional[AdditOwnerTemplatesInfo]:
         result = await self.session.execute(
-            select(
-                Template,
-                func.count(Star.id).label('stars_count')
-            )
+            select(Template)
             .join(User, Template.owner_id == User.id)
-            .join(Star, Template.id == Star.template_id, isouter=True)
             .where(
                 Template.name == template_name,
                 User.username == owner_name
             )
-            .group_by(Template.id)
         )
 
-        row = result.first()
-        if not row:
+        template = result.scalars().first()
+        if not template:
             return None
 
-        template, stars_count = row
-
         return AdditOwnerTemplatesInfo(
             name=template.name,
             is_public=template.is_public,
-            stars=stars_count,
+            stars=template.stars_count,
             content=template.content,
             last_update=template.updated_at
         )
 
-    async def get_public_template_info(
+    async def get_owner_template_version(
             self,
             template_name: str,
-            user_id: int
-    ) -> Optional[AdditPublicTemplatesInfo]:
-        starred_subquery = (
-            select(1)
+            owner_name: str
+    ) -> Optional[Tuple[datetime, int]]:
+        result = await self.session.execute(
+            select(Template.updated_at, Template.stars_count)
+            .join(User, Template.owner_id == User.id)
             .where(
-                Star.template_id == Template.id,
-                Star.user_id == user_id
+                Template.name == template_name,
+                User.username == owner_name
             )
-            .correlate(Template)
         )
 
-        query = (
-            select(
-                Template,
-                func.count(Star.id).label('stars_count'),
-                exists(starred_subquery).label('starred_by_user')
-            )
-            .join(User, Template.owner_id == User.id)
-            .join(Star, Template.id == Star.template_id, isouter=True)
+        version = result.first()
+        return tuple(version) if version else None
+
+    async def get_public_template_version(
+            self,
+            template_name: str
+    ) -> Optional[Tuple[int, datetime, int]]:
+        result = await self.session.execute(
+            select(Template.id, Template.updated_at, Template.stars_count)
             .where(
                 Template.name == template_name,
                 Template.is_public == True
             )
-            .group_by(Template.id)
         )
 
-        result = await self.session.execute(query)
-        row = result.first()
+        version = result.first()
+        return tuple(version) if version else None
 
-        if not row:
-            return None
+    async def get_public_template_info(
+            self,
+            template_name: str
+    ) -> Optional[PublicTemplateDetails]:
+        result = await self.session.execute(
+            select(Template)
+            .where(
+                Template.name == template_name,
+                Template.is_public == True
+            )
+        )
 
-        template, stars_count, starred_by_user = row
+        template = result.scalars().first()
+        if not template:
+            return None
 
-        return AdditPublicTemplatesInfo(
+        return PublicTemplateDetails(
+            id=template.id,
             name=template.name,
-            stars=stars_count,
+            stars=template.stars_count,
             content=template.content,
             is_public=template.is_public,
-            starred_by_user=bool(starred_by_user) if user_id is not None else False,
             last_update=template.updated_at
         )
 
     async def get_all_by_owner(
             self,
-            owner_id: int
-    ):
-
-        result = await self.session.execute(
-            select(Template)
-            .where(Template.owner_id == owner_id)
-            .group_by(Template.id)
+            owner_id: int,
+            limit: int,
+            after: Optional[List[Any]] = None
+    ) -> Page[OwnerTemplatesInfo]:
+        rows, next_cursor = await self.paginate(
+            query=self.select(*LIST_COLUMNS).where(Template.owner_id == owner_id),
+            order_by=TEMPLATE_ORDERINGS[TemplateOrder.updated],
+            order=TemplateOrder.updated.value,
+            limit=limit,
+            after=after
         )
 
-        templates = result.scalars().all()
-        if templates:
-            return [
+        return Page[OwnerTemplatesInfo](
+            items=[
                 OwnerTemplatesInfo(
                     name=template.name,
                     last_update=template.updated_at
                 )
-                for template in templates]
+                for template, in rows
+            ],
+            next_cursor=next_cursor
+        )
 
-    async def get_all_public(self, user_id):
-        starred_subquery = (
-            select(1)
-            .where(
-                Star.template_id == Template.id,
-                Star.user_id == user_id
-            )
-            .correlate(Template)
+    async def get_all_public(
+            self,
+            order: TemplateOrder,
+            limit: int,
+            after: Optional[List[Any]] = None
+    ) -> Page[PublicTemplateEntry]:
+        rows, next_cursor = await self.paginate(
+            query=self.select(*LIST_COLUMNS).where(Template.is_public == True),
+            order_by=TEMPLATE_ORDERINGS[order],
+            order=order.value,
+            limit=limit,
+            after=after
         )
 
+        return Page[PublicTemplateEntry](
+            items=[
+                PublicTemplateEntry(
+                    id=template.id,
+                    name=template.name,
+                    stars=template.stars_count,
+                    last_update=template.updated_at
+                )
+                for template, in rows
+            ],
+            next_cursor=next_cursor
+        )
+
+    async def search(
+            self,
+            query_text: str,
+            user_id: int,
+            limit: int,
+            after: Optional[List[Any]] = None
+    ) -> Page[PublicTemplatesInfo]:
+        ts_query = func.websearch_to_tsquery(SEARCH_CONFIG, query_text)
+        rank = func.ts_rank_cd(Template.__table__.c.search_vector, ts_query)
+
         query = (
-            select(
-                Template,
-                func.count(Star.id).label('stars_count'),
-                exists(starred_subquery).label('starred_by_user')
-            )
-            .join(User, Template.owner_id == User.id, isouter=True)
-            .join(Star, Template.id == Star.template_id, isouter=True)
+            self.select(*LIST_COLUMNS)
+            .add_columns(starred_by_user(user_id))
             .where(
-                Template.is_public == True
+                Template.is_public == True,
+                Template.__table__.c.search_vector.bool_op("@@")(ts_query)
             )
-            .group_by(Template.id, Template.name, Template.owner_id, Template.is_public, Template.updated_at)
-        # все поля Template
         )
 
-        result = await self.session.execute(query)
-        rows = result.all()
+        rows, next_cursor = await self.paginate(
+            query=query,
+            order_by=(rank, Template.id),
+            order="rank",
+            limit=limit,
+            after=after
+        )
 
-        if not rows:
-            return []
+        return Page[PublicTemplatesInfo](
+            items=[
+                PublicTemplatesInfo(
+                    name=template.name,
+                    stars=template.stars_count,
+                    starred_by_user=bool(is_starred) if user_id is not None else False,
+                    last_update=template.updated_at
+                )
+                for template, is_starred in rows
+            ],
+            next_cursor=next_cursor
+        )
 
-        return [
-            PublicTemplatesInfo(
-                name=template.name,
-                stars=stars_count,
-                starred_by_user=bool(starred_by_user) if user_id is not None else False,
-                last_update=template.updated_at
+    async def reconcile_stars_count(self) -> int:
+        actual_count = (
+            select(func.count(Star.id))
+            .where(Star.template_id == Template.id)
+            .correlate(Template)
+            .scalar_subquery()
+        )
+
+        result = await self.session.execute(
+            update(Template)
+            .where(Template.stars_count != actual_count)
+            .values(
+                stars_count=actual_count,
+                updated_at=Template.updated_at
             )
-            for template, stars_count, starred_by_user in rows
-        ]
+            .returning(Template.id)
+        )
+        return len(result.all())
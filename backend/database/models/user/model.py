@@ -1,3 +1,4 @@
+from sqlalchemy import Index, text
 from sqlalchemy.orm import Mapped, mapped_column, relationship
 from database.core import Base
 from utils.mixins.timestamp import TimestampMixin
@@ -5,6 +6,9 @@ from utils.mixins.timestamp import TimestampMixin
 
 class User(Base, TimestampMixin):
     __tablename__ = "users"
+    __table_args__ = (
+        Index("ix_users_username_lower", text("lower(username)"), unique=True),
+    )
 
     id: Mapped[int] = mapped_column(primary_key=True, autoincrement=True)
     username: Mapped[str] = mapped_column(unique=True, nullable=False)
@@ -35,6 +35,8 @@ class UserRepository(BaseRepository[User, UserRead]):
         result = await self.session.execute(
             select(self.model)
             .where(func.lower(self.model.username) == func.lower(username))
+            .order_by((self.model.username != username), self.model.id)
+            .limit(1)
         )
         user = result.scalar_one_or_none()
         return UserRead.model_validate(user) if user else None
@@ -47,14 +49,6 @@ class UserRepository(BaseRepository[User, UserRead]):
         user = result.scalar_one_or_none()
         return UserRead.model_validate(user) if user else None
 
-    async def get_by_username(self, username: int) -> Optional[UserRead]:
-        result = await self.session.execute(
-            select(self.model)
-            .where(self.model.username == username)
-        )
-        user = result.scalar_one_or_none()
-        return UserRead.model_validate(user) if user else None
-
     async def update_user_profile(
             self,
             user_id: int,
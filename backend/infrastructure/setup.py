@@ -8,5 +8,5 @@ logger = Logger(name="doc_builder")
 async def setup_db():
     logger.debug(msg="Start setup db")
     await cook_models()
-    await init_db()
-    logger.debug(msg="Success setup db")
+    is_migrated = await init_db()
+    logger.debug(msg="Success setup db" if is_migrated else "Schema is up to date")
@@ -0,0 +1,62 @@
+import asyncio
+import os
+from typing import Awaitable, Callable, List
+
+from infrastructure.setup import logger
+from services.collaboration import collaboration
+from services.core.room_document_service import RoomDocumentService
+from services.core.template_service import TemplateService
+
+
+async def run_periodic(name: str, interval: float, job: Callable[[], Awaitable]):
+    while True:
+        await asyncio.sleep(interval)
+        try:
+            result = await job()
+            if result:
+                logger.info(msg=f"{name}: {result}")
+        except asyncio.CancelledError:
+            raise
+        except Exception as e:
+            logger.error(msg=f"{name} failed: {e}")
+
+
+def start_background_tasks() -> List[asyncio.Task]:
+    return [
+        asyncio.create_task(run_periodic(
+            name="reconcile_stars_count",
+            interval=float(os.getenv("STARS_RECONCILE_INTERVAL", 3600)),
+            job=TemplateService.reconcile_stars_count
+        )),
+        asyncio.create_task(run_periodic(
+            name="flush_room_updates",
+            interval=float(os.getenv("ROOM_FLUSH_INTERVAL", 2)),
+            job=collaboration.flush_updates
+        )),
+        asyncio.create_task(run_periodic(
+            name="reap_dead_peers",
+            interval=float(os.getenv("COLLAB_HEARTBEAT_INTERVAL", 10)),
+            job=collaboration.heartbeat
+        )),
+        asyncio.create_task(run_periodic(
+            name="evict_idle_rooms",
+            interval=float(os.getenv("ROOM_EVICT_INTERVAL", 30)),
+            job=collaboration.evict_rooms
+        )),
+        asyncio.create_task(run_periodic(
+            name="compact_room_updates",
+            interval=float(os.getenv("ROOM_COMPACT_INTERVAL", 60)),
+            job=RoomDocumentService.compact_rooms
+        )),
+    ]
+
+
+async def stop_background_tasks(tasks: List[asyncio.Task]):
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+    try:
+        await collaboration.flush_updates()
+    except Exception as e:
+        logger.error(msg=f"flush_room_updates failed on shutdown: {e}")
@@ -3,13 +3,26 @@ from contextlib import asynccontextmanager
 from fastapi import FastAPI
 from fastapi.middleware.cors import CORSMiddleware
 from api.router import router
+from database.core import init_engine, dispose_engine
 from infrastructure.setup import setup_db
+from infrastructure.tasks import start_background_tasks, stop_background_tasks
+from services.collaboration import collaboration
+from utils.hash_manager import shutdown_hash_executor
+from utils.jwt_manager import load_jwt_settings
 
 
 @asynccontextmanager
 async def lifespan(app: FastAPI):
+    load_jwt_settings()
+    await init_engine()
     await setup_db()
+    await collaboration.start()
+    tasks = start_background_tasks()
     yield
+    await stop_background_tasks(tasks)
+    await collaboration.close()
+    shutdown_hash_executor()
+    await dispose_engine()
 
 
 app = FastAPI(
@@ -0,0 +1,60 @@
+"""hot path indexes
+
+Revision ID: 0002
+Revises: 0001
+Create Date: 2026-10-18 10:05:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0002"
+down_revision: Union[str, Sequence[str], None] = "0001"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.create_index(
+        "ix_users_username_lower",
+        "users",
+        [sa.text("lower(username)")]
+    )
+    op.create_index(
+        "ix_templates_owner_id_name",
+        "templates",
+        ["owner_id", "name"]
+    )
+    op.create_index(
+        "ix_templates_name",
+        "templates",
+        ["name"]
+    )
+    op.create_index(
+        "ix_templates_public_updated_at",
+        "templates",
+        ["updated_at"],
+        postgresql_where=sa.text("is_public")
+    )
+    op.create_index(
+        "ix_stars_template_id",
+        "stars",
+        ["template_id"]
+    )
+    op.create_index(
+        "ix_rooms_owner_id",
+        "rooms",
+        ["owner_id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rooms_owner_id", table_name="rooms")
+    op.drop_index("ix_stars_template_id", table_name="stars")
+    op.drop_index("ix_templates_public_updated_at", table_name="templates")
+    op.drop_index("ix_templates_name", table_name="templates")
+    op.drop_index("ix_templates_owner_id_name", table_name="templates")
+    op.drop_index("ix_users_username_lower", table_name="users")
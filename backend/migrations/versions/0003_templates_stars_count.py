@@ -0,0 +1,40 @@
+"""denormalized templates.stars_count
+
+Revision ID: 0003
+Revises: 0002
+Create Date: 2026-10-18 10:10:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0003"
+down_revision: Union[str, Sequence[str], None] = "0002"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "templates",
+        sa.Column("stars_count", sa.Integer(), nullable=False, server_default="0")
+    )
+    op.execute(
+        """
+        UPDATE templates
+        SET stars_count = counts.stars_count
+        FROM (
+            SELECT template_id, COUNT(id) AS stars_count
+            FROM stars
+            GROUP BY template_id
+        ) AS counts
+        WHERE templates.id = counts.template_id
+        """
+    )
+
+
+def downgrade() -> None:
+    op.drop_column("templates", "stars_count")
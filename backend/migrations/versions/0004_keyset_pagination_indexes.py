@@ -0,0 +1,64 @@
+"""keyset pagination indexes
+
+Revision ID: 0004
+Revises: 0003
+Create Date: 2026-10-18 10:15:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0004"
+down_revision: Union[str, Sequence[str], None] = "0003"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.drop_index("ix_templates_public_updated_at", table_name="templates")
+    op.drop_index("ix_rooms_owner_id", table_name="rooms")
+
+    op.create_index(
+        "ix_templates_owner_id_updated_at_id",
+        "templates",
+        ["owner_id", "updated_at", "id"]
+    )
+    op.create_index(
+        "ix_templates_public_updated_at_id",
+        "templates",
+        ["updated_at", "id"],
+        postgresql_where=sa.text("is_public")
+    )
+    op.create_index(
+        "ix_templates_public_stars_count_id",
+        "templates",
+        ["stars_count", "id"],
+        postgresql_where=sa.text("is_public")
+    )
+    op.create_index(
+        "ix_rooms_owner_id_updated_at_id",
+        "rooms",
+        ["owner_id", "updated_at", "id"]
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_rooms_owner_id_updated_at_id", table_name="rooms")
+    op.drop_index("ix_templates_public_stars_count_id", table_name="templates")
+    op.drop_index("ix_templates_public_updated_at_id", table_name="templates")
+    op.drop_index("ix_templates_owner_id_updated_at_id", table_name="templates")
+
+    op.create_index(
+        "ix_rooms_owner_id",
+        "rooms",
+        ["owner_id"]
+    )
+    op.create_index(
+        "ix_templates_public_updated_at",
+        "templates",
+        ["updated_at"],
+        postgresql_where=sa.text("is_public")
+    )
@@ -0,0 +1,45 @@
+"""templates full text search
+
+Revision ID: 0005
+Revises: 0004
+Create Date: 2026-10-18 10:20:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+from sqlalchemy.dialects import postgresql
+
+
+revision: str = "0005"
+down_revision: Union[str, Sequence[str], None] = "0004"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column(
+        "templates",
+        sa.Column(
+            "search_vector",
+            postgresql.TSVECTOR(),
+            sa.Computed(
+                "setweight(to_tsvector('simple', coalesce(name, '')), 'A') || "
+                "setweight(to_tsvector('simple', left(coalesce(content, ''), 100000)), 'B')",
+                persisted=True
+            ),
+            nullable=True
+        )
+    )
+    op.create_index(
+        "ix_templates_search_vector",
+        "templates",
+        ["search_vector"],
+        postgresql_using="gin"
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_templates_search_vector", table_name="templates")
+    op.drop_column("templates", "search_vector")
@@ -0,0 +1,37 @@
+"""room document persistence
+
+Revision ID: 0006
+Revises: 0005
+Create Date: 2026-10-18 11:05:00
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0006"
+down_revision: Union[str, Sequence[str], None] = "0005"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    op.add_column("rooms", sa.Column("snapshot", sa.LargeBinary(), nullable=True))
+    op.create_table(
+        "room_updates",
+        sa.Column("id", sa.BigInteger(), autoincrement=True, nullable=False),
+        sa.Column("room_id", sa.Integer(), nullable=False),
+        sa.Column("data", sa.LargeBinary(), nullable=False),
+        sa.Column("created_at", sa.DateTime(timezone=True), server_default=sa.text("now()"), nullable=False),
+        sa.ForeignKeyConstraint(["room_id"], ["rooms.id"], ondelete="CASCADE"),
+        sa.PrimaryKeyConstraint("id")
+    )
+    op.create_index("ix_room_updates_room_id_id", "room_updates", ["room_id", "id"])
+
+
+def downgrade() -> None:
+    op.drop_index("ix_room_updates_room_id_id", table_name="room_updates")
+    op.drop_table("room_updates")
+    op.drop_column("rooms", "snapshot")
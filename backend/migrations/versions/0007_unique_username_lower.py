@@ -0,0 +1,53 @@
+"""unique lower(username)
+
+Revision ID: 0007
+Revises: 0006
+Create Date: 2026-10-18 12:10:00
+
+The unique index is only created when no two usernames differ by case alone.
+Otherwise the plain index is kept and lookups resolve to the exact-case match,
+then the oldest account. To enforce uniqueness later, rename the duplicates
+listed by
+
+    SELECT lower(username), array_agg(id ORDER BY id) FROM users
+    GROUP BY lower(username) HAVING count(*) > 1;
+
+and re-run this revision with `alembic downgrade 0006 && alembic upgrade head`.
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+revision: str = "0007"
+down_revision: Union[str, Sequence[str], None] = "0006"
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    duplicates = op.get_bind().execute(sa.text(
+        "SELECT count(*) FROM (SELECT 1 FROM users GROUP BY lower(username) HAVING count(*) > 1) AS duplicates"
+    )).scalar_one()
+    if duplicates:
+        print(f"Skipping unique ix_users_username_lower: {duplicates} usernames differ only by case")
+        return
+
+    op.drop_index("ix_users_username_lower", table_name="users")
+    op.create_index(
+        "ix_users_username_lower",
+        "users",
+        [sa.text("lower(username)")],
+        unique=True
+    )
+
+
+def downgrade() -> None:
+    op.drop_index("ix_users_username_lower", table_name="users")
+    op.create_index(
+        "ix_users_username_lower",
+        "users",
+        [sa.text("lower(username)")]
+    )
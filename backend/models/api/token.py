@@ -3,3 +3,8 @@ from pydantic import BaseModel
 
 class TokenPayload(BaseModel):
     access_token: str
+
+
+class TokenPrincipal(BaseModel):
+    user_id: int
+    username: str
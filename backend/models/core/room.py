@@ -26,3 +26,13 @@ class RoomRead(RoomCreate):
 
     class Config:
         from_attributes = True
+
+
+class RoomUpdateLogRead(BaseModel):
+    id: int
+    room_id: int
+    data: bytes
+    created_at: datetime
+
+    class Config:
+        from_attributes = True
@@ -1,4 +1,5 @@
 from datetime import datetime
+from enum import Enum
 from typing import Optional
 
 from pydantic import BaseModel
@@ -29,6 +30,11 @@ class TemplateRead(TemplateCreate):
         from_attributes = True
 
 
+class TemplateOrder(str, Enum):
+    updated = "updated"
+    stars = "stars"
+
+
 class PublicTemplatesInfo(BaseModel):
     name: str
     stars: int
@@ -52,3 +58,15 @@ class AdditPublicTemplatesInfo(OwnerTemplatesInfo):
     content: str
     is_public: bool
     starred_by_user: bool
+
+
+class PublicTemplateEntry(BaseModel):
+    id: int
+    name: str
+    stars: int
+    last_update: datetime
+
+
+class PublicTemplateDetails(PublicTemplateEntry):
+    content: str
+    is_public: bool
@@ -32,3 +32,12 @@ class UserRead(UserCreate):
 
     class Config:
         from_attributes = True
+
+
+class UserProfile(UserBase):
+    id: int
+    created_at: datetime
+    updated_at: datetime
+
+    class Config:
+        from_attributes = True
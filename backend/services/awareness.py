@@ -0,0 +1,92 @@
+import asyncio
+from typing import Dict, Iterable, List, Optional, Set, Tuple
+
+from utils.yprotocol import encode_awareness, parse_awareness
+
+
+NULL_STATE = b"null"
+REMOTE = object()
+
+AwarenessEntry = Tuple[int, int, bytes]
+
+
+class AwarenessMetrics:
+    def __init__(self):
+        self.received = 0
+        self.applied = 0
+        self.stale = 0
+        self.removed = 0
+        self.frames_out = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "received": self.received,
+            "applied": self.applied,
+            "stale": self.stale,
+            "removed": self.removed,
+            "frames_out": self.frames_out
+        }
+
+
+awareness_metrics = AwarenessMetrics()
+
+
+def is_newer(current: Optional[Tuple[int, bytes]], clock: int, state: bytes) -> bool:
+    if current is None or clock > current[0]:
+        return True
+    return clock == current[0] and state == NULL_STATE and current[1] != NULL_STATE
+
+
+def merge_awareness(payloads: List[memoryview]) -> bytes:
+    states: Dict[int, Tuple[int, bytes]] = {}
+    for payload in payloads:
+        for client_id, clock, state in parse_awareness(payload):
+            if is_newer(states.get(client_id), clock, state):
+                states[client_id] = (clock, state)
+
+    return encode_awareness([(client_id, *states[client_id]) for client_id in states])
+
+
+class RoomAwareness:
+    def __init__(self):
+        self.states: Dict[int, Tuple[int, bytes]] = {}
+        self.dirty: Dict[int, object] = {}
+        self.timer: Optional[asyncio.TimerHandle] = None
+        self.flushed_at = 0.0
+
+    def apply(self, entries: Iterable[AwarenessEntry], origin: object) -> bool:
+        changed = False
+        for client_id, clock, state in entries:
+            awareness_metrics.received += 1
+            if not is_newer(self.states.get(client_id), clock, state):
+                awareness_metrics.stale += 1
+                continue
+
+            self.states[client_id] = (clock, state)
+            self.dirty[client_id] = origin
+            awareness_metrics.applied += 1
+            changed = True
+        return changed
+
+    def remove(self, client_ids: Iterable[int]) -> bool:
+        entries = [
+            (client_id, self.states[client_id][0] + 1, NULL_STATE)
+            for client_id in client_ids
+            if client_id in self.states and self.states[client_id][1] != NULL_STATE
+        ]
+        awareness_metrics.removed += len(entries)
+        return self.apply(entries, None)
+
+    def encode_states(self) -> Optional[bytes]:
+        entries = [
+            (client_id, clock, state)
+            for client_id, (clock, state) in self.states.items()
+            if state != NULL_STATE
+        ]
+        return encode_awareness(entries) if entries else None
+
+    def take_dirty(self) -> Tuple[List[AwarenessEntry], List[AwarenessEntry], Set[object]]:
+        dirty, self.dirty = self.dirty, {}
+        entries = [(client_id, *self.states[client_id]) for client_id in dirty]
+        local = [entry for entry in entries if dirty[entry[0]] is not REMOTE]
+        return entries, local, set(dirty.values())
@@ -0,0 +1,246 @@
+import asyncio
+import os
+import weakref
+from collections import deque
+from typing import Any, Callable, Coroutine, Deque, Dict, List, NamedTuple, Optional
+
+from starlette.websockets import WebSocket
+
+
+class BroadcastMetrics:
+    def __init__(self):
+        self.groups = weakref.WeakSet()
+        self.frames = 0
+        self.deliveries = 0
+        self.overflowed = 0
+        self.resynced = 0
+        self.demoted = 0
+        self.read_only_dropped = 0
+
+    def snapshot(self) -> dict:
+        groups = list(self.groups)
+        return {
+            "groups": len(groups),
+            "viewers": sum(len(group.members) for group in groups),
+            "depth_max": max((group.depth for group in groups), default=0),
+            "frames": self.frames,
+            "deliveries": self.deliveries,
+            "overflowed": self.overflowed,
+            "resynced": self.resynced,
+            "demoted": self.demoted,
+            "read_only_dropped": self.read_only_dropped
+        }
+
+
+broadcast_metrics = BroadcastMetrics()
+
+
+class GroupFrame(NamedTuple):
+    message: dict
+    mark: Any
+    sender: Optional[WebSocket]
+    target: Optional[WebSocket]
+
+
+class ViewerBacklog:
+    def __init__(self, task: asyncio.Task, frame: GroupFrame, started: float):
+        self.task = task
+        self.frame = frame
+        self.started = started
+        self.frames: Deque[GroupFrame] = deque()
+
+
+async def _finish_send(coro: Coroutine, blocker: Any):
+    loop = asyncio.get_running_loop()
+    try:
+        while True:
+            if blocker is None:
+                await asyncio.sleep(0)
+            else:
+                resumed = loop.create_future()
+                blocker.add_done_callback(lambda _: resumed.done() or resumed.set_result(None))
+                await resumed
+            blocker = coro.send(None)
+    except StopIteration:
+        return
+    finally:
+        coro.close()
+
+
+class BroadcastGroup:
+    MAXSIZE = int(os.getenv("COLLAB_BROADCAST_QUEUE_SIZE", 1024))
+    BACKLOG_SIZE = int(os.getenv("COLLAB_BROADCAST_VIEWER_BACKLOG", 64))
+    SEND_TIMEOUT = float(os.getenv("COLLAB_BROADCAST_SEND_TIMEOUT_MS", 1000)) / 1000
+
+    def __init__(
+            self,
+            mark: Callable[[], Any],
+            resync: Callable[[Any], bytes],
+            on_demote: Callable[[WebSocket, List[bytes], Any], None],
+            maxsize: Optional[int] = None,
+            backlog_size: Optional[int] = None,
+            send_timeout: Optional[float] = None
+    ):
+        self.mark = mark
+        self.resync = resync
+        self.on_demote = on_demote
+        self.maxsize = maxsize or BroadcastGroup.MAXSIZE
+        self.backlog_size = backlog_size or BroadcastGroup.BACKLOG_SIZE
+        self.send_timeout = send_timeout or BroadcastGroup.SEND_TIMEOUT
+        self.members: Dict[WebSocket, None] = {}
+        self.frames: Deque[GroupFrame] = deque()
+        self.stale = False
+        self.stale_mark: Any = None
+        self.closed = False
+        self._busy: Dict[WebSocket, ViewerBacklog] = {}
+        self._waiter: Optional[asyncio.Future] = None
+        self._loop = asyncio.get_running_loop()
+        self._writer = asyncio.create_task(self._run())
+        self._watchdog = self._loop.call_later(self.send_timeout / 2, self._check_sends)
+        broadcast_metrics.groups.add(self)
+
+    @property
+    def depth(self) -> int:
+        return len(self.frames)
+
+    def add(self, websocket: WebSocket):
+        self.members[websocket] = None
+
+    def remove(self, websocket: WebSocket):
+        self.members.pop(websocket, None)
+        backlog = self._busy.pop(websocket, None)
+        if backlog is not None:
+            backlog.task.cancel()
+
+    def put(self, frame: bytes, sender: Optional[WebSocket] = None):
+        if self.closed or not self.members:
+            return
+
+        mark = self.mark()
+        if len(self.frames) >= self.maxsize:
+            broadcast_metrics.overflowed += 1
+            if not self.stale or mark is None or (self.stale_mark is not None and mark < self.stale_mark):
+                self.stale_mark = mark
+            self.stale = True
+            return
+
+        self._append(GroupFrame({"type": "websocket.send", "bytes": frame}, mark, sender, None))
+
+    def send_to(self, websocket: WebSocket, frame: bytes) -> bool:
+        if self.closed or websocket not in self.members:
+            return False
+
+        self._append(GroupFrame({"type": "websocket.send", "bytes": frame}, self.mark(), None, websocket))
+        return True
+
+    def close(self):
+        self.closed = True
+        for websocket in list(self.members):
+            self.remove(websocket)
+        self.frames.clear()
+        self._watchdog.cancel()
+        self._writer.cancel()
+
+    def _check_sends(self):
+        now = self._loop.time()
+        for websocket, backlog in list(self._busy.items()):
+            if now - backlog.started >= self.send_timeout:
+                self._demote(websocket, backlog.frame.mark, TimeoutError("send timed out"))
+        self._watchdog = self._loop.call_later(self.send_timeout / 2, self._check_sends)
+
+    def _append(self, frame: GroupFrame):
+        self.frames.append(frame)
+        broadcast_metrics.frames += 1
+        if self._waiter is not None and not self._waiter.done():
+            self._waiter.set_result(None)
+
+    def _demote(self, websocket: WebSocket, mark: Any, reason: BaseException):
+        print(f"Broadcast viewer demoted: {reason!r}")
+        broadcast_metrics.demoted += 1
+
+        pending = []
+        backlog = self._busy.get(websocket)
+        if backlog is not None:
+            unsent = [backlog.frame] if not backlog.task.done() else []
+            pending.extend(frame.message["bytes"] for frame in [*unsent, *backlog.frames] if frame.target is websocket)
+        pending.extend(frame.message["bytes"] for frame in self.frames if frame.target is websocket)
+        if any(frame.target is websocket for frame in self.frames):
+            self.frames = deque(frame for frame in self.frames if frame.target is not websocket)
+
+        self.remove(websocket)
+        self.on_demote(websocket, pending, mark)
+
+    def _start(self, websocket: WebSocket, frame: GroupFrame, backlog: Optional[ViewerBacklog] = None) -> bool:
+        coro = websocket.send(frame.message)
+        try:
+            blocker = coro.send(None)
+        except StopIteration:
+            broadcast_metrics.deliveries += 1
+            return True
+        except Exception as e:
+            self._demote(websocket, frame.mark, e)
+            return False
+
+        task = self._loop.create_task(_finish_send(coro, blocker))
+        if backlog is None:
+            backlog = ViewerBacklog(task, frame, self._loop.time())
+        else:
+            backlog.task, backlog.frame, backlog.started = task, frame, self._loop.time()
+        self._busy[websocket] = backlog
+        task.add_done_callback(lambda done: self._sent(websocket, done))
+        return False
+
+    def _sent(self, websocket: WebSocket, task: asyncio.Task):
+        backlog = self._busy.get(websocket)
+        if backlog is None or backlog.task is not task:
+            return
+
+        error = TimeoutError("send cancelled") if task.cancelled() else task.exception()
+        if error is not None:
+            self._demote(websocket, backlog.frame.mark, error)
+            return
+
+        broadcast_metrics.deliveries += 1
+        while backlog.frames:
+            if not self._start(websocket, backlog.frames.popleft(), backlog):
+                return
+        del self._busy[websocket]
+
+    def _write(self, websocket: WebSocket, frame: GroupFrame):
+        backlog = self._busy.get(websocket)
+        if backlog is None:
+            self._start(websocket, frame)
+            return
+
+        if len(backlog.frames) >= self.backlog_size:
+            self._demote(websocket, backlog.frame.mark, OverflowError("viewer backlog full"))
+            return
+        backlog.frames.append(frame)
+
+    def _deliver(self, frame: GroupFrame):
+        if frame.target is not None:
+            if frame.target in self.members:
+                self._write(frame.target, frame)
+            return
+
+        for websocket in [websocket for websocket in self.members if websocket is not frame.sender]:
+            if websocket in self.members:
+                self._write(websocket, frame)
+
+    async def _run(self):
+        while True:
+            if not self.frames:
+                if self.stale:
+                    self.stale = False
+                    broadcast_metrics.resynced += 1
+                    self.put(self.resync(self.stale_mark))
+                    continue
+
+                self._waiter = self._loop.create_future()
+                try:
+                    await self._waiter
+                finally:
+                    self._waiter = None
+                continue
+
+            self._deliver(self.frames.popleft())
@@ -0,0 +1,279 @@
+import json
+import os
+from collections import defaultdict
+from typing import Any, Dict, List, Optional, Tuple, Type, TypeVar
+
+from pydantic import BaseModel
+
+from models.core.user import UserProfile
+from services.redis_client import AsyncRedisClient
+from utils.ttl_cache import TTLCache
+
+M = TypeVar('M', bound=BaseModel)
+
+
+class CacheMetrics:
+    def __init__(self):
+        self.hits: Dict[str, int] = defaultdict(int)
+        self.misses: Dict[str, int] = defaultdict(int)
+
+    def hit(self, namespace: str):
+        self.hits[namespace] += 1
+
+    def miss(self, namespace: str):
+        self.misses[namespace] += 1
+
+    def snapshot(self) -> Dict[str, Dict[str, float]]:
+        stats = {}
+        for namespace in set(self.hits) | set(self.misses):
+            hits, misses = self.hits[namespace], self.misses[namespace]
+            stats[namespace] = {
+                "hits": hits,
+                "misses": misses,
+                "hit_ratio": hits / (hits + misses) if hits + misses else 0.0
+            }
+        return stats
+
+
+cache_metrics = CacheMetrics()
+
+
+class CatalogCache:
+    VERSION_KEY = "templates:catalog:version"
+    TTL = int(os.getenv("CATALOG_CACHE_TTL", 300))
+    STARS_TTL = int(os.getenv("CATALOG_STARS_TTL", 3600))
+    EMPTY_MEMBER = "0"
+
+    @staticmethod
+    async def get_version(redis_client: AsyncRedisClient) -> str:
+        return await redis_client.get_value(CatalogCache.VERSION_KEY) or "0"
+
+    @staticmethod
+    async def bump_version(redis_client: AsyncRedisClient):
+        await redis_client.incr_value(CatalogCache.VERSION_KEY)
+
+    @staticmethod
+    def make_key(namespace: str, version: str, *parts: Any) -> str:
+        return ":".join(["templates", namespace, f"v{version}", *(json.dumps(part, default=str) for part in parts)])
+
+    @staticmethod
+    async def get(
+            redis_client: AsyncRedisClient,
+            namespace: str,
+            key: str,
+            model: Type[M]
+    ) -> Optional[M]:
+        cached = await redis_client.get_value(key)
+        if cached is None:
+            cache_metrics.miss(namespace)
+            return None
+
+        cache_metrics.hit(namespace)
+        return model.model_validate_json(cached)
+
+    @staticmethod
+    async def set(redis_client: AsyncRedisClient, key: str, value: BaseModel):
+        await redis_client.set_value(
+            key=key,
+            value=value.model_dump_json(),
+            expire=CatalogCache.TTL
+        )
+
+    @staticmethod
+    def starred_version_key(user_id: int) -> str:
+        return f"templates:starred:{user_id}:version"
+
+    @staticmethod
+    async def get_starred_version(redis_client: AsyncRedisClient, user_id: int) -> str:
+        return await redis_client.get_value(CatalogCache.starred_version_key(user_id)) or "0"
+
+    @staticmethod
+    def starred_key(user_id: int, version: str) -> str:
+        return f"templates:starred:{user_id}:v{version}"
+
+    @staticmethod
+    async def get_starred_flags(
+            redis_client: AsyncRedisClient,
+            user_id: int,
+            version: str,
+            template_ids: List[int]
+    ) -> Optional[List[bool]]:
+        if not template_ids:
+            return []
+
+        flags = await redis_client.check_members(
+            key=CatalogCache.starred_key(user_id, version),
+            members=[str(template_id) for template_id in template_ids]
+        )
+
+        if flags is None:
+            cache_metrics.miss("starred")
+        else:
+            cache_metrics.hit("starred")
+        return flags
+
+    @staticmethod
+    async def set_starred(
+            redis_client: AsyncRedisClient,
+            user_id: int,
+            version: str,
+            template_ids: List[int]
+    ):
+        await redis_client.add_members(
+            key=CatalogCache.starred_key(user_id, version),
+            members=[CatalogCache.EMPTY_MEMBER, *(str(template_id) for template_id in template_ids)],
+            expire=CatalogCache.STARS_TTL
+        )
+
+    @staticmethod
+    async def drop_starred(redis_client: AsyncRedisClient, user_id: int):
+        await redis_client.incr_value(CatalogCache.starred_version_key(user_id))
+
+
+class UserCache:
+    TTL = int(os.getenv("USER_CACHE_TTL", 600))
+    by_id: TTLCache[int, UserProfile] = TTLCache(
+        maxsize=int(os.getenv("USER_CACHE_SIZE", 1024)),
+        ttl=float(os.getenv("USER_CACHE_LOCAL_TTL", 30))
+    )
+    by_name: TTLCache[str, int] = TTLCache(
+        maxsize=int(os.getenv("USER_CACHE_SIZE", 1024)),
+        ttl=float(os.getenv("USER_CACHE_LOCAL_TTL", 30))
+    )
+
+    @staticmethod
+    def normalize(username: str) -> str:
+        return username.strip().lower()
+
+    @staticmethod
+    def id_key(user_id: int) -> str:
+        return f"users:id:{user_id}"
+
+    @staticmethod
+    def name_key(username: str) -> str:
+        return f"users:name:{UserCache.normalize(username)}"
+
+    @staticmethod
+    async def get_by_id(redis_client: AsyncRedisClient, user_id: int) -> Optional[UserProfile]:
+        user = UserCache.by_id.get(user_id)
+        if user is not None:
+            cache_metrics.hit("user_local")
+            return user
+        cache_metrics.miss("user_local")
+
+        cached = await redis_client.get_value(UserCache.id_key(user_id))
+        if cached is None:
+            cache_metrics.miss("user")
+            return None
+
+        cache_metrics.hit("user")
+        user = UserProfile.model_validate_json(cached)
+        UserCache.by_id.set(user_id, user)
+        return user
+
+    @staticmethod
+    async def get_by_username(redis_client: AsyncRedisClient, username: str) -> Optional[UserProfile]:
+        normalized = UserCache.normalize(username)
+
+        user_id = UserCache.by_name.get(normalized)
+        if user_id is None:
+            user_id = await redis_client.get_value(UserCache.name_key(normalized))
+        if user_id is None:
+            cache_metrics.miss("user")
+            return None
+
+        user = await UserCache.get_by_id(redis_client, int(user_id))
+        if user is None or UserCache.normalize(user.username) != normalized:
+            return None
+
+        UserCache.by_name.set(normalized, user.id)
+        return user
+
+    @staticmethod
+    async def set(redis_client: AsyncRedisClient, user: UserProfile):
+        UserCache.by_id.set(user.id, user)
+        UserCache.by_name.set(UserCache.normalize(user.username), user.id)
+
+        await redis_client.set_values(
+            values={
+                UserCache.id_key(user.id): user.model_dump_json(),
+                UserCache.name_key(user.username): str(user.id)
+            },
+            expire=UserCache.TTL
+        )
+
+    @staticmethod
+    async def invalidate(redis_client: AsyncRedisClient, user_id: int):
+        UserCache.by_id.pop(user_id)
+        await redis_client.delete_value(UserCache.id_key(user_id))
+
+
+class RoomAclCache:
+    TTL = int(os.getenv("ROOM_ACL_TTL", 3600))
+    owners: TTLCache[str, int] = TTLCache(
+        maxsize=int(os.getenv("ROOM_ACL_CACHE_SIZE", 4096)),
+        ttl=float(os.getenv("ROOM_ACL_TTL", 3600))
+    )
+    members: TTLCache[Tuple[str, int], str] = TTLCache(
+        maxsize=int(os.getenv("ROOM_ACL_CACHE_SIZE", 4096)),
+        ttl=float(os.getenv("ROOM_ACL_LOCAL_TTL", 5))
+    )
+
+    @staticmethod
+    def owner_key(room_uuid: str) -> str:
+        return f"rooms:owner:{room_uuid}"
+
+    @staticmethod
+    def member_key(room_uuid: str, user_id: int) -> str:
+        return f"{room_uuid}:{user_id}"
+
+    @staticmethod
+    async def get(
+            redis_client: AsyncRedisClient,
+            room_uuid: str,
+            user_id: int
+    ) -> Tuple[Optional[int], Optional[str]]:
+        owner_id = RoomAclCache.owners.get(room_uuid)
+        permissions = RoomAclCache.members.get((room_uuid, user_id))
+        if owner_id is not None and (owner_id == user_id or permissions is not None):
+            cache_metrics.hit("room_acl_local")
+            return owner_id, permissions
+        cache_metrics.miss("room_acl_local")
+
+        cached_owner, permissions = await redis_client.get_values([
+            RoomAclCache.owner_key(room_uuid),
+            RoomAclCache.member_key(room_uuid, user_id)
+        ])
+
+        if cached_owner is None:
+            cache_metrics.miss("room_acl")
+        else:
+            cache_metrics.hit("room_acl")
+            owner_id = int(cached_owner)
+            RoomAclCache.owners.set(room_uuid, owner_id)
+
+        if permissions is not None:
+            RoomAclCache.members.set((room_uuid, user_id), permissions)
+        return owner_id, permissions
+
+    @staticmethod
+    async def set_owner(redis_client: AsyncRedisClient, room_uuid: str, owner_id: int):
+        RoomAclCache.owners.set(room_uuid, owner_id)
+        await redis_client.set_value(
+            key=RoomAclCache.owner_key(room_uuid),
+            value=str(owner_id),
+            expire=RoomAclCache.TTL
+        )
+
+    @staticmethod
+    def set_member(room_uuid: str, user_id: int, permissions: str):
+        RoomAclCache.members.set((room_uuid, user_id), permissions)
+
+    @staticmethod
+    def drop_member(room_uuid: str, user_id: int):
+        RoomAclCache.members.pop((room_uuid, user_id))
+
+    @staticmethod
+    async def invalidate(redis_client: AsyncRedisClient, room_uuid: str):
+        RoomAclCache.owners.pop(room_uuid)
+        await redis_client.delete_value(RoomAclCache.owner_key(room_uuid))
@@ -0,0 +1,99 @@
+import asyncio
+import os
+from typing import Awaitable, Callable, Dict, List, Optional, Set
+
+from pycrdt import merge_updates
+from starlette.websockets import WebSocket
+
+from utils.yprotocol import encode_update
+
+
+FlushHandler = Callable[[str, bytes, Optional[WebSocket]], Awaitable]
+
+
+class PendingUpdates:
+    def __init__(self, started: float):
+        self.started = started
+        self.frames: List[bytes] = []
+        self.updates: List[bytes] = []
+        self.senders: Set[WebSocket] = set()
+        self.timer: Optional[asyncio.TimerHandle] = None
+
+
+class UpdateCoalescer:
+    WINDOW = float(os.getenv("COLLAB_COALESCE_WINDOW_MS", 0)) / 1000
+    MAX_DELAY = float(os.getenv("COLLAB_COALESCE_MAX_DELAY_MS", 50)) / 1000
+
+    def __init__(
+            self,
+            flush: FlushHandler,
+            window: Optional[float] = None,
+            max_delay: Optional[float] = None
+    ):
+        self.flush = flush
+        self.window = UpdateCoalescer.WINDOW if window is None else window
+        self.max_delay = UpdateCoalescer.MAX_DELAY if max_delay is None else max_delay
+        self.pending: Dict[str, PendingUpdates] = {}
+        self.updates_in = 0
+        self.frames_out = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.window > 0
+
+    def add(self, room_id: str, frame: bytes, update: bytes, sender: WebSocket):
+        loop = asyncio.get_running_loop()
+        now = loop.time()
+
+        pending = self.pending.get(room_id)
+        if pending is None:
+            pending = self.pending[room_id] = PendingUpdates(started=now)
+
+        pending.frames.append(frame)
+        pending.updates.append(update)
+        pending.senders.add(sender)
+        self.updates_in += 1
+
+        if pending.timer is not None:
+            pending.timer.cancel()
+
+        delay = min(self.window, pending.started + self.max_delay - now)
+        pending.timer = loop.call_later(max(delay, 0), self._schedule, room_id)
+
+    def _schedule(self, room_id: str):
+        asyncio.ensure_future(self.flush_room(room_id))
+
+    async def flush_room(self, room_id: str):
+        pending = self.pending.pop(room_id, None)
+        if pending is None:
+            return
+
+        if pending.timer is not None:
+            pending.timer.cancel()
+
+        if len(pending.frames) == 1:
+            frame = pending.frames[0]
+        else:
+            frame = encode_update(merge_updates(*pending.updates))
+
+        sender = next(iter(pending.senders)) if len(pending.senders) == 1 else None
+        self.frames_out += 1
+
+        try:
+            await self.flush(room_id, frame, sender)
+        except Exception as e:
+            print(f"Coalesced flush error for room {room_id}: {e}")
+
+    async def close(self):
+        for room_id in list(self.pending):
+            await self.flush_room(room_id)
+
+    def snapshot(self) -> dict:
+        return {
+            "window_ms": self.window * 1000,
+            "max_delay_ms": self.max_delay * 1000,
+            "pending_rooms": len(self.pending),
+            "updates_in": self.updates_in,
+            "frames_out": self.frames_out,
+            "ratio": self.updates_in / self.frames_out if self.frames_out else 0.0
+        }
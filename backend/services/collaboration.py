@@ -1,32 +1,318 @@
-from typing import Dict
+import asyncio
+import os
+from time import monotonic
+from typing import Dict, List, Optional
+from pycrdt import merge_updates
 from starlette.websockets import WebSocket
 from starlette import status
 
+from services.awareness import NULL_STATE, REMOTE, RoomAwareness, awareness_metrics, merge_awareness
+from services.broadcast_group import BroadcastGroup, broadcast_metrics
+from services.coalescer import UpdateCoalescer
+from services.core.room_document_service import RoomDocumentService
 from services.core.room_service import RoomService
+from services.fanout import LocalFanout, create_fanout
+from services.peer import Peer, heartbeat_metrics
 from services.redis_client import AsyncRedisClient
+from services.room_document import EMPTY_UPDATE, RoomDocument
+from services.room_registry import RoomRegistry
+from services.send_queue import SendQueue
 from utils.jwt_manager import decode_access_token
+from utils.yprotocol import (
+    MESSAGE_AWARENESS,
+    MESSAGE_QUERY_AWARENESS,
+    MESSAGE_SYNC,
+    SYNC_STEP1,
+    SYNC_UPDATE,
+    YMessage,
+    encode_awareness,
+    encode_query_awareness,
+    encode_sync_step1,
+    encode_sync_step2,
+    encode_update,
+    parse_awareness,
+    parse_message
+)
+
+def coalesce_updates(frames: List[bytes]) -> List[bytes]:
+    updates, awareness, others = [], [], []
+    for frame in frames:
+        try:
+            parsed = parse_message(frame)
+        except ValueError:
+            others.append(frame)
+            continue
+
+        if parsed.message_type == MESSAGE_SYNC and parsed.sync_type == SYNC_UPDATE:
+            updates.append(bytes(parsed.payload))
+        elif parsed.message_type == MESSAGE_AWARENESS:
+            awareness.append((frame, parsed.payload))
+        else:
+            others.append(frame)
+
+    if len(updates) < 2 and len(awareness) < 2:
+        return frames
+
+    if len(awareness) > 1:
+        try:
+            others.append(merge_awareness([payload for _, payload in awareness]))
+        except ValueError:
+            others.extend(frame for frame, _ in awareness)
+    elif awareness:
+        others.append(awareness[0][0])
+
+    if len(updates) > 1:
+        others.append(encode_update(merge_updates(*updates)))
+    elif updates:
+        others.append(encode_update(updates[0]))
+    return others
+
 
 class Collaboration:
-    def __init__(self):
-        self.rooms: Dict[str, Dict[WebSocket, str]] = {}
+    AWARENESS_INTERVAL = float(os.getenv("COLLAB_AWARENESS_INTERVAL_MS", 100)) / 1000
+    PING_INTERVAL = float(os.getenv("COLLAB_PING_INTERVAL", 20))
+    PEER_TIMEOUT = float(os.getenv("COLLAB_PEER_TIMEOUT", 60))
+
+    def __init__(self, persistent: bool = True, fanout: Optional[LocalFanout] = None):
+        self.rooms: Dict[str, Dict[WebSocket, Peer]] = {}
+        self.documents = RoomRegistry()
+        self.awareness: Dict[str, RoomAwareness] = {}
+        self.viewers: Dict[str, BroadcastGroup] = {}
+        self.awareness_interval = Collaboration.AWARENESS_INTERVAL
+        self.ping_interval = Collaboration.PING_INTERVAL
+        self.peer_timeout = Collaboration.PEER_TIMEOUT
+        self.persistent = persistent
+        self.fanout = fanout or create_fanout()
+        self.coalescer = UpdateCoalescer(flush=self.relay_held)
+        self._loading: Dict[str, asyncio.Future] = {}
+        self._evicting: Dict[str, asyncio.Future] = {}
+
+    async def start(self):
+        await self.fanout.start(self.deliver_remote)
+
+    async def close(self):
+        await self.coalescer.close()
+        for room_id in list(self.awareness):
+            await self.flush_awareness(room_id)
+        await self.fanout.close()
+
+    async def get_document(self, room_id: str) -> RoomDocument:
+        document = self.documents.get(room_id)
+        if document is not None:
+            return document
+
+        if room_id not in self._loading:
+            self._loading[room_id] = asyncio.ensure_future(self._load_document(room_id))
+
+        loading = self._loading[room_id]
+        try:
+            return await asyncio.shield(loading)
+        finally:
+            if loading.done() and self._loading.get(room_id) is loading:
+                del self._loading[room_id]
+
+    async def _load_document(self, room_id: str) -> RoomDocument:
+        document = None
+        if self.persistent:
+            document = await RoomDocumentService.load_document(room_uuid=room_id)
+
+        document = document or RoomDocument(room_id)
+
+        evicting = self._evicting.get(room_id)
+        if evicting is not None:
+            await evicting
+        self.documents.add(document)
+
+        try:
+            await self.fanout.subscribe(room_id)
+            await self.fanout.publish(room_id, encode_sync_step1(document.get_state()))
+        except Exception as e:
+            print(f"Fan-out subscribe error for room {room_id}: {e}")
+
+        return document
+
+    async def flush_updates(self) -> int:
+        locked, entries = [], []
+        try:
+            for document in self.documents.values():
+                if not document.pending or document.room_pk is None or document.flush_lock.locked():
+                    continue
+
+                await document.flush_lock.acquire()
+                locked.append(document)
+                updates, document.pending = document.pending, []
+                update = merge_updates(*updates) if len(updates) > 1 else updates[0]
+                entries.append((document, update))
+
+            if not entries:
+                return 0
+
+            try:
+                await RoomDocumentService.append_updates(
+                    entries=[(document.room_pk, update) for document, update in entries]
+                )
+            except BaseException:
+                for document, update in entries:
+                    document.pending.insert(0, update)
+                raise
+
+            return len(entries)
+        finally:
+            for document in locked:
+                document.flush_lock.release()
+
+    async def flush_document(self, document: RoomDocument) -> bool:
+        if not document.pending or document.room_pk is None:
+            return False
+
+        updates, document.pending = document.pending, []
+        update = merge_updates(*updates) if len(updates) > 1 else updates[0]
+
+        try:
+            await RoomDocumentService.append_updates(entries=[(document.room_pk, update)])
+        except BaseException:
+            document.pending.insert(0, update)
+            raise
+
+        return True
+
+    async def evict_rooms(self) -> int:
+        if not self.persistent:
+            return 0
+
+        evicted = 0
+        for document in self.documents.eviction_candidates(active=self.rooms):
+            try:
+                if await self.unload_room(document.room_id):
+                    evicted += 1
+            except Exception as e:
+                print(f"Room eviction error for room {document.room_id}: {e}")
+        return evicted
+
+    async def unload_room(self, room_id: str) -> bool:
+        document = self.documents.peek(room_id)
+        if document is None or room_id in self.rooms or room_id in self._evicting:
+            return False
+
+        evicting = asyncio.get_running_loop().create_future()
+        self._evicting[room_id] = evicting
+        try:
+            await self.coalescer.flush_room(room_id)
+
+            async with document.flush_lock:
+                await self.flush_document(document)
+
+                if room_id in self.rooms or document.pending or self.documents.peek(room_id) is not document:
+                    return False
+
+                self.documents.remove(room_id)
+                self.awareness.pop(room_id, None)
+
+            try:
+                await self.fanout.unsubscribe(room_id)
+            except Exception as e:
+                print(f"Fan-out unsubscribe error for room {room_id}: {e}")
+            return True
+        finally:
+            del self._evicting[room_id]
+            evicting.set_result(None)
+
+    async def connect(self, room_id: str, websocket: WebSocket, user_id: str, permissions: Optional[str] = None):
+        document = await self.get_document(room_id)
+
+        queue = SendQueue(
+            send=websocket.send_bytes,
+            coalesce=coalesce_updates,
+            resync=lambda since: encode_update(
+                document.get_update() if since is None else document.get_update_since(since)
+            ),
+            mark=lambda: self._resync_mark(room_id, websocket),
+            on_close=lambda reason: self._drop_peer(room_id, websocket, reason)
+        )
 
-    async def connect(self, room_id: str, websocket: WebSocket, user_id: str):
         if room_id not in self.rooms:
             self.rooms[room_id] = {}
-        self.rooms[room_id][websocket] = user_id
+        peer = Peer(websocket, user_id, queue, permissions)
+        self.rooms[room_id][websocket] = peer
+
+        if peer.read_only:
+            if room_id not in self.viewers:
+                self.viewers[room_id] = BroadcastGroup(
+                    mark=lambda: self._group_mark(room_id),
+                    resync=lambda since: encode_update(
+                        document.get_update() if since is None else document.get_update_since(since)
+                    ),
+                    on_demote=lambda viewer, pending, mark: self._demote_viewer(room_id, viewer, pending, mark)
+                )
+            peer.group = self.viewers[room_id]
+            peer.group.add(websocket)
+
+        peer.send(encode_sync_step1(document.get_state()))
+
+        awareness = self.awareness.get(room_id)
+        states = awareness.encode_states() if awareness else None
+        if states:
+            peer.send(states)
+
+    def _resync_mark(self, room_id: str, websocket: WebSocket) -> Optional[int]:
+        peer = self.rooms.get(room_id, {}).get(websocket)
+        document = self.documents.peek(room_id)
+        if peer is None or document is None or not peer.synced:
+            return None
+        return document.held_since or document.log.seq
+
+    def _group_mark(self, room_id: str) -> Optional[int]:
+        document = self.documents.peek(room_id)
+        if document is None:
+            return None
+        return document.held_since or document.log.seq
+
+    def _demote_viewer(self, room_id: str, websocket: WebSocket, pending: List[bytes], mark: Optional[int]):
+        peer = self.rooms.get(room_id, {}).get(websocket)
+        if peer is None:
+            return
+
+        peer.group = None
+        for frame in pending:
+            peer.queue.put(frame)
+        peer.queue.mark_stale(mark if peer.synced else None)
 
     def disconnect(self, room_id: str, websocket: WebSocket):
         if room_id in self.rooms and websocket in self.rooms[room_id]:
-            del self.rooms[room_id][websocket]
+            peer = self.rooms[room_id].pop(websocket)
+            peer.queue.close()
             if not self.rooms[room_id]:
                 del self.rooms[room_id]
 
+            group = self.viewers.get(room_id) if peer.read_only else None
+            peer.group = None
+            if group is not None:
+                group.remove(websocket)
+                if not group.members:
+                    group.close()
+                    del self.viewers[room_id]
+
+            awareness = self.awareness.get(room_id)
+            if awareness is None:
+                return
+            if peer.awareness_ids and awareness.remove(peer.awareness_ids):
+                self._schedule_awareness(room_id, awareness)
+            elif room_id not in self.rooms and awareness.timer is None:
+                del self.awareness[room_id]
+
+    async def _drop_peer(self, room_id: str, websocket: WebSocket, reason: str):
+        self.disconnect(room_id, websocket)
+        try:
+            await websocket.close(code=status.WS_1013_TRY_AGAIN_LATER, reason=reason)
+        except Exception as e:
+            print(f"Error closing websocket: {e}")
+
     async def disconnect_user(self, room_id: str, user_id: str):
         if room_id not in self.rooms:
             return
         disconnected = []
-        for ws in list(self.rooms[room_id].keys()):
-            if self.rooms[room_id][ws] == user_id:
+        for ws, peer in list(self.rooms[room_id].items()):
+            if peer.user_id == user_id:
                 try:
                     await ws.close(code=status.WS_1008_POLICY_VIOLATION)
                     disconnected.append(ws)
@@ -35,15 +321,256 @@ class Collaboration:
         for ws in disconnected:
             self.disconnect(room_id, ws)
 
-    async def broadcast(self, room_id: str, message: bytes, sender: WebSocket):
-        if room_id in self.rooms:
-            for connection in list(self.rooms[room_id].keys()):
-                if connection != sender:
-                    try:
-                        await connection.send_bytes(message)
-                    except Exception as e:
-                        print(f"Broadcast error: {e}")
-                        self.disconnect(room_id, connection)
+    async def heartbeat(self) -> int:
+        now = monotonic()
+        ping = encode_query_awareness()
+        dead = []
+
+        for room_id, peers in self.rooms.items():
+            for websocket, peer in peers.items():
+                silent = now - peer.last_seen
+                if silent >= self.peer_timeout:
+                    dead.append((room_id, websocket))
+                elif silent >= self.ping_interval and now - peer.pinged_at >= self.ping_interval:
+                    peer.pinged_at = now
+                    peer.send(ping)
+                    heartbeat_metrics.pings += 1
+
+        for room_id, websocket in dead:
+            self.disconnect(room_id, websocket)
+            heartbeat_metrics.reaped += 1
+            asyncio.ensure_future(self._close_dead(websocket))
+
+        return len(dead)
+
+    async def _close_dead(self, websocket: WebSocket):
+        try:
+            await asyncio.wait_for(
+                websocket.close(code=status.WS_1001_GOING_AWAY, reason="heartbeat timeout"),
+                timeout=self.ping_interval
+            )
+        except Exception as e:
+            print(f"Error closing websocket: {e}")
+
+    async def broadcast(self, room_id: str, message: bytes, sender: Optional[WebSocket]):
+        group = self.viewers.get(room_id)
+        for connection, peer in self.rooms.get(room_id, {}).items():
+            if connection != sender and peer.group is None:
+                peer.send(message)
+
+        if group is not None:
+            group.put(message, sender)
+
+    def send(self, room_id: str, websocket: WebSocket, message: bytes) -> bool:
+        peer = self.rooms.get(room_id, {}).get(websocket)
+        return peer.send(message) if peer is not None else False
+
+    async def handle_message(self, room_id: str, message: bytes, sender: WebSocket):
+        peer = self.rooms.get(room_id, {}).get(sender)
+        if peer is None:
+            return
+        peer.last_seen = monotonic()
+
+        try:
+            parsed = parse_message(message)
+        except ValueError as e:
+            print(f"Malformed message: {e}")
+            return
+
+        if peer.read_only and not self._viewer_allowed(parsed):
+            broadcast_metrics.read_only_dropped += 1
+            return
+
+        if parsed.message_type == MESSAGE_SYNC:
+            await self.handle_sync(room_id, message, parsed, sender)
+            return
+
+        if parsed.message_type == MESSAGE_AWARENESS:
+            self.handle_awareness(room_id, parsed, sender)
+            return
+
+        if parsed.message_type == MESSAGE_QUERY_AWARENESS:
+            awareness = self.awareness.get(room_id)
+            states = awareness.encode_states() if awareness else None
+            if states:
+                self.send(room_id, sender, states)
+            return
+
+        await self.relay(room_id, message, sender)
+
+    @staticmethod
+    def _viewer_allowed(parsed: YMessage) -> bool:
+        if parsed.message_type == MESSAGE_SYNC:
+            return parsed.sync_type == SYNC_STEP1
+        return parsed.message_type in (MESSAGE_AWARENESS, MESSAGE_QUERY_AWARENESS)
+
+    def handle_awareness(self, room_id: str, parsed: YMessage, origin: object):
+        peer = None
+        if origin is not REMOTE:
+            peer = self.rooms.get(room_id, {}).get(origin)
+            if peer is None:
+                return
+        elif room_id not in self.rooms:
+            return
+
+        try:
+            entries = parse_awareness(parsed.payload)
+        except ValueError as e:
+            print(f"Malformed awareness update: {e}")
+            return
+
+        if peer is not None:
+            for client_id, _, state in entries:
+                if state == NULL_STATE:
+                    peer.awareness_ids.discard(client_id)
+                else:
+                    peer.awareness_ids.add(client_id)
+
+        if room_id not in self.awareness:
+            self.awareness[room_id] = RoomAwareness()
+
+        awareness = self.awareness[room_id]
+        if awareness.apply(entries, origin):
+            self._schedule_awareness(room_id, awareness)
+
+    def _schedule_awareness(self, room_id: str, awareness: RoomAwareness):
+        if awareness.timer is not None:
+            return
+
+        loop = asyncio.get_running_loop()
+        delay = max(awareness.flushed_at + self.awareness_interval - loop.time(), 0)
+        awareness.timer = loop.call_later(
+            delay,
+            lambda: asyncio.ensure_future(self.flush_awareness(room_id))
+        )
+
+    async def flush_awareness(self, room_id: str):
+        awareness = self.awareness.get(room_id)
+        if awareness is None:
+            return
+
+        if awareness.timer is not None:
+            awareness.timer.cancel()
+            awareness.timer = None
+        awareness.flushed_at = asyncio.get_running_loop().time()
+
+        entries, local, origins = awareness.take_dirty()
+        if entries:
+            frame = encode_awareness(entries)
+            sender = next(iter(origins)) if len(origins) == 1 else None
+            await self.broadcast(room_id, frame, None if sender is REMOTE else sender)
+            awareness_metrics.frames_out += 1
+
+            if local:
+                try:
+                    await self.fanout.publish(
+                        room_id,
+                        frame if len(local) == len(entries) else encode_awareness(local)
+                    )
+                except Exception as e:
+                    print(f"Fan-out publish error for room {room_id}: {e}")
+
+        if room_id not in self.rooms and not awareness.dirty:
+            self.awareness.pop(room_id, None)
+
+    async def relay(self, room_id: str, message: bytes, sender: WebSocket):
+        await self.broadcast(room_id, message, sender)
+        await self.publish(room_id, message)
+
+    async def relay_held(self, room_id: str, message: bytes, sender: Optional[WebSocket]):
+        await self.broadcast(room_id, message, sender)
+
+        document = self.documents.peek(room_id)
+        if document is not None:
+            document.held_since = None
+
+        await self.publish(room_id, message)
+
+    async def publish(self, room_id: str, message: bytes):
+        try:
+            await self.fanout.publish(room_id, message)
+        except Exception as e:
+            print(f"Fan-out publish error for room {room_id}: {e}")
+
+    async def deliver_remote(self, room_id: str, message: bytes):
+        document = self.documents.get(room_id)
+        if document is None:
+            return
+
+        try:
+            parsed = parse_message(message)
+        except ValueError as e:
+            print(f"Malformed remote message: {e}")
+            return
+
+        if parsed.message_type == MESSAGE_AWARENESS:
+            self.handle_awareness(room_id, parsed, REMOTE)
+            return
+
+        if parsed.message_type == MESSAGE_SYNC:
+            if parsed.sync_type == SYNC_STEP1:
+                try:
+                    update = document.get_update(parsed.payload)
+                except ValueError:
+                    return
+                if update != EMPTY_UPDATE:
+                    await self.fanout.publish(room_id, encode_update(update))
+                return
+
+            try:
+                update = document.apply_update(parsed.payload)
+            except Exception as e:
+                print(f"Rejected remote update for room {room_id}: {e}")
+                return
+
+            if update == EMPTY_UPDATE:
+                return
+            if parsed.sync_type != SYNC_UPDATE or update != parsed.payload:
+                message = encode_update(update)
+
+        await self.broadcast(room_id, message, None)
+
+    async def handle_sync(self, room_id: str, message: bytes, parsed: YMessage, sender: WebSocket):
+        document = await self.get_document(room_id)
+
+        if parsed.sync_type == SYNC_STEP1:
+            try:
+                update = document.get_update(parsed.payload)
+            except ValueError:
+                update = document.get_update()
+
+            peer = self.rooms.get(room_id, {}).get(sender)
+            if peer is not None:
+                peer.synced = peer.send(encode_sync_step2(update))
+            return
+
+        if parsed.payload == EMPTY_UPDATE:
+            return
+
+        try:
+            update = document.apply_update(parsed.payload)
+        except Exception as e:
+            print(f"Rejected update for room {room_id}: {e}")
+            return
+
+        if update == EMPTY_UPDATE:
+            return
+
+        if document.room_pk is not None:
+            document.pending.append(update)
+
+        if parsed.sync_type == SYNC_UPDATE and update == parsed.payload:
+            frame = message
+        else:
+            frame = encode_update(update)
+
+        if self.coalescer.enabled:
+            if document.held_since is None:
+                document.held_since = document.log.seq
+            self.coalescer.add(room_id, frame, update, sender)
+            return
+
+        await self.relay(room_id, frame, sender)
 
     @staticmethod
     async def verify_access(
@@ -55,20 +582,11 @@ class Collaboration:
             token_data = decode_access_token(token=access_token)
             user_id = token_data.get("user_id")
 
-            existing_room = await RoomService.get_by_room_uuid(
-                owner_id=user_id,
-                room_uuid=room_uuid
+            permissions = await RoomService.get_permissions(
+                redis_client=redis_client,
+                room_uuid=room_uuid,
+                user_id=user_id
             )
-            if existing_room:
-                return {
-                    "room_id": room_uuid,
-                    "permissions": "owner",
-                    "user_id": user_id
-                }
-
-            permissions = await redis_client.get_value(f"{room_uuid}:{user_id}")
-            print(room_uuid, user_id)
-            print(permissions)
             if permissions:
                 return {
                     "room_id": room_uuid,
@@ -80,4 +598,7 @@ class Collaboration:
 
         except Exception as e:
             print(f"Access verification error: {e}")
-            return None
\ No newline at end of file
+            return None
+
+
+collaboration = Collaboration()
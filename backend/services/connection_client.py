@@ -1,17 +1,35 @@
+import asyncio
+import os
 from typing import Dict, Optional, List
 from starlette.websockets import WebSocket
 
 from services.core.room_service import RoomService
 from services.redis_client import AsyncRedisClient
+from services.send_queue import SendQueue
 import json
 from datetime import datetime
 
 from utils.jwt_manager import decode_access_token
 
 
+def apply_delta(document: dict, version: str, delta: Dict[str, str]):
+    content = document["content"]
+    index = min(int(delta["index"]), len(content))
+    end = index + int(delta["delete"])
+
+    document["content"] = content[:index] + delta["insert"] + content[end:]
+    document["version"] = version
+    document["last_modified_by"] = delta["user_id"]
+    document["last_modified_at"] = delta["at"]
+
+
 class ConnectionManager:
+    COMPACT_THRESHOLD = int(os.getenv("DOC_STREAM_COMPACT_THRESHOLD", 200))
+    HISTORY_SIZE = int(os.getenv("DOC_STREAM_HISTORY", 100))
+
     def __init__(self):
         self.active_connections: Dict[str, Dict[str, WebSocket]] = {}
+        self.queues: Dict[WebSocket, SendQueue] = {}
         self.redis = AsyncRedisClient()
 
     async def authenticate_connection(self, websocket: WebSocket, room_id: str, access_token: str) -> Optional[str]:
@@ -38,12 +56,22 @@ class ConnectionManager:
         await websocket.accept()
         if room_id not in self.active_connections:
             self.active_connections[room_id] = {}
+        previous = self.active_connections[room_id].get(user_id)
+        if previous is not None and previous in self.queues:
+            self.queues.pop(previous).close()
         self.active_connections[room_id][user_id] = websocket
+        self.queues[websocket] = SendQueue(
+            send=websocket.send_json,
+            on_close=lambda reason: self.disconnect(room_id, user_id)
+        )
         await self.notify_presence(room_id, user_id, True)
 
     async def disconnect(self, room_id: str, user_id: str):
         if room_id in self.active_connections and user_id in self.active_connections[room_id]:
-            del self.active_connections[room_id][user_id]
+            websocket = self.active_connections[room_id].pop(user_id)
+            queue = self.queues.pop(websocket, None)
+            if queue is not None:
+                queue.close()
             await self.notify_presence(room_id, user_id, False)
             if not self.active_connections[room_id]:
                 del self.active_connections[room_id]
@@ -78,38 +106,106 @@ class ConnectionManager:
             for uid, connection in self.active_connections[room_id].items():
                 if exclude_user_ids and uid in exclude_user_ids:
                     continue
-                try:
-                    await connection.send_json(message)
-                except Exception as e:
-                    print(f"Error sending to {uid}: {e}")
-                    await self.disconnect(room_id, uid)
+                self.queues[connection].put(message)
+
+    @staticmethod
+    def snapshot_key(room_id: str) -> str:
+        return f"doc:{room_id}"
+
+    @staticmethod
+    def stream_key(room_id: str) -> str:
+        return f"doc:{room_id}:log"
 
     async def get_document(self, room_id: str) -> Optional[dict]:
-        doc = await self.redis.get_value(f"doc:{room_id}")
-        return json.loads(doc) if doc else None
+        snapshot = await self.redis.get_value(self.snapshot_key(room_id))
+        document = json.loads(snapshot) if snapshot else None
+
+        version = document.get("version") if document else None
+        entries = await self.redis.read_stream(
+            self.stream_key(room_id),
+            start=f"({version}" if isinstance(version, str) else "-"
+        )
 
-    async def update_document(self, room_id: str, user_id: str, content: str) -> dict:
-        doc_key = f"doc:{room_id}"
+        if document is None and not entries:
+            return None
 
-        current = await self.get_document(room_id) or {
-            "content": "",
-            "version": 0,
-            "history": []
+        document = {
+            "content": document["content"] if document else "",
+            "version": version if isinstance(version, str) else "0-0",
+            "last_modified_by": document.get("last_modified_by") if document else None,
+            "last_modified_at": document.get("last_modified_at") if document else None
+        }
+        for entry_id, delta in entries:
+            apply_delta(document, entry_id, delta)
+
+        return document
+
+    async def update_document(
+            self,
+            room_id: str,
+            user_id: str,
+            index: int,
+            delete: int,
+            insert: str
+    ) -> dict:
+        delta = {
+            "index": str(index),
+            "delete": str(delete),
+            "insert": insert,
+            "user_id": str(user_id),
+            "at": datetime.utcnow().isoformat()
         }
 
-        new_version = current["version"] + 1
-        updated = {
-            "content": content,
-            "version": new_version,
-            "last_modified_by": user_id,
-            "last_modified_at": datetime.utcnow().isoformat(),
-            "history": current["history"][-9:] + [{
-                "content": current["content"],
-                "version": current["version"],
-                "modified_by": current.get("last_modified_by"),
-                "modified_at": current.get("last_modified_at")
-            }]
+        version, length = await self.redis.append_stream(self.stream_key(room_id), delta)
+        if length > self.COMPACT_THRESHOLD + self.HISTORY_SIZE:
+            asyncio.ensure_future(self.compact_document(room_id))
+
+        return {
+            "version": version,
+            "index": index,
+            "delete": delete,
+            "insert": insert,
+            "modified_by": user_id,
+            "modified_at": delta["at"]
         }
 
-        await self.redis.set_value(doc_key, json.dumps(updated))
-        return updated
\ No newline at end of file
+    async def get_history(self, room_id: str, count: int = 10) -> List[dict]:
+        entries = await self.redis.read_stream_reverse(self.stream_key(room_id), count=count)
+        return [
+            {
+                "version": entry_id,
+                "index": int(delta["index"]),
+                "delete": int(delta["delete"]),
+                "insert": delta["insert"],
+                "modified_by": delta["user_id"],
+                "modified_at": delta["at"]
+            }
+            for entry_id, delta in entries
+        ]
+
+    async def compact_document(self, room_id: str) -> Optional[str]:
+        lock_key = f"doc:{room_id}:compacting"
+        if not await self.redis.set_if_absent(lock_key, "1", expire=30):
+            return None
+
+        try:
+            document = await self.get_document(room_id)
+            if document is None:
+                return None
+
+            await self.redis.set_value(self.snapshot_key(room_id), json.dumps(document))
+
+            retained = await self.redis.read_stream_reverse(
+                self.stream_key(room_id),
+                end=document["version"],
+                count=max(self.HISTORY_SIZE, 1)
+            )
+            if len(retained) == max(self.HISTORY_SIZE, 1):
+                await self.redis.trim_stream(self.stream_key(room_id), min_id=retained[-1][0])
+
+            return document["version"]
+        except Exception as e:
+            print(f"Document compaction error for room {room_id}: {e}")
+            return None
+        finally:
+            await self.redis.delete_value(lock_key)
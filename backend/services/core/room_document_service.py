@@ -0,0 +1,97 @@
+import os
+from datetime import datetime, timedelta, timezone
+from typing import List, Optional, Sequence, Tuple
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.core import use_session
+from database.models.room.repository import RoomRepository
+from database.models.room_update.repository import RoomUpdateLogRepository
+from services.room_document import RoomDocument
+
+
+class RoomDocumentService:
+    COMPACT_MIN_UPDATES = int(os.getenv("ROOM_COMPACT_MIN_UPDATES", 100))
+    COMPACT_MAX_AGE = int(os.getenv("ROOM_COMPACT_MAX_AGE", 600))
+    COMPACT_BATCH = int(os.getenv("ROOM_COMPACT_BATCH", 50))
+
+    @staticmethod
+    async def load_document(
+            room_uuid: str,
+            session: Optional[AsyncSession] = None
+    ) -> Optional[RoomDocument]:
+        async with use_session(session) as session:
+            state = await RoomRepository(session=session).get_document_state(
+                room_uuid=room_uuid
+            )
+            if state is None:
+                return None
+
+            room_pk, snapshot = state
+            updates = await RoomUpdateLogRepository(session=session).get_updates(
+                room_id=room_pk
+            )
+
+        return RoomDocumentService._build_document(room_uuid, room_pk, snapshot, updates)
+
+    @staticmethod
+    async def append_updates(
+            entries: Sequence[Tuple[int, bytes]],
+            session: Optional[AsyncSession] = None
+    ):
+        async with use_session(session) as session:
+            await RoomUpdateLogRepository(session=session).append_updates(
+                entries=entries
+            )
+
+    @staticmethod
+    async def compact_room(room_pk: int, session: Optional[AsyncSession] = None) -> int:
+        async with use_session(session) as session:
+            room_repo = RoomRepository(session=session)
+            log_repo = RoomUpdateLogRepository(session=session)
+
+            snapshot = await room_repo.lock_snapshot(room_id=room_pk)
+            updates = await log_repo.get_updates(room_id=room_pk)
+            if not updates:
+                return 0
+
+            document = RoomDocumentService._build_document(str(room_pk), room_pk, snapshot, updates)
+            await room_repo.save_snapshot(
+                room_id=room_pk,
+                snapshot=document.get_update(),
+                content=document.get_text()
+            )
+            await log_repo.delete_updates(
+                update_ids=[update_id for update_id, _ in updates]
+            )
+
+            return len(updates)
+
+    @staticmethod
+    async def compact_rooms(session: Optional[AsyncSession] = None) -> int:
+        async with use_session(session) as session:
+            room_ids = await RoomUpdateLogRepository(session=session).get_rooms_to_compact(
+                min_updates=RoomDocumentService.COMPACT_MIN_UPDATES,
+                older_than=datetime.now(timezone.utc) - timedelta(seconds=RoomDocumentService.COMPACT_MAX_AGE),
+                limit=RoomDocumentService.COMPACT_BATCH
+            )
+
+        compacted = 0
+        for room_pk in room_ids:
+            compacted += await RoomDocumentService.compact_room(room_pk=room_pk)
+
+        return compacted
+
+    @staticmethod
+    def _build_document(
+            room_uuid: str,
+            room_pk: int,
+            snapshot: Optional[bytes],
+            updates: List[Tuple[int, bytes]]
+    ) -> RoomDocument:
+        document = RoomDocument(room_id=room_uuid, room_pk=room_pk)
+        if snapshot:
+            document.load([snapshot])
+        document.load(data for _, data in updates)
+
+        return document
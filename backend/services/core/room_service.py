@@ -1,19 +1,29 @@
 import uuid
-from typing import Optional
+from datetime import datetime
+from typing import Any, List, Optional
 
-from database.core import get_session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.core import use_session
 from database.models.room.repository import RoomRepository
+from models.api.room import RoomInfo
 from models.core.room import RoomRead, RoomUpdate, RoomBase, RoomCreate
+from services.cache import RoomAclCache
 from services.core.user_service import UserService
 from services.redis_client import AsyncRedisClient
 from utils.hash_manager import encrypt
+from utils.pagination import Page
 from utils.room import generate_password
 
 
 class RoomService:
     @staticmethod
-    async def create_room(room_init_data: RoomBase, user_id: int) -> RoomRead:
-        async with get_session() as session:
+    async def create_room(
+            room_init_data: RoomBase,
+            user_id: int,
+            session: Optional[AsyncSession] = None
+    ) -> RoomRead:
+        async with use_session(session) as session:
             repo = RoomRepository(session=session)
 
             room_uuid = str(uuid.uuid4())
@@ -28,24 +38,61 @@ class RoomService:
             new_room = await repo.create_room(
                 room_data=new_room
             )
+            await session.commit()
 
             return new_room
 
     @staticmethod
-    async def update_room_settings(room_uuid: str, update_data: RoomUpdate) -> bool:
-        async with get_session() as session:
+    async def update_room_settings(
+            room_uuid: str,
+            update_data: RoomUpdate,
+            redis_client: AsyncRedisClient,
+            session: Optional[AsyncSession] = None
+    ) -> bool:
+        async with use_session(session) as session:
             repo = RoomRepository(session=session)
 
             updated_room = await repo.update_room_settings(
                 room_uuid=room_uuid,
                 update_data=update_data
             )
+            await session.commit()
+
+        await RoomAclCache.invalidate(redis_client, room_uuid)
+        return True if updated_room else False
+
+    @staticmethod
+    async def get_permissions(
+            redis_client: AsyncRedisClient,
+            room_uuid: str,
+            user_id: int,
+            session: Optional[AsyncSession] = None
+    ) -> Optional[str]:
+        owner_id, permissions = await RoomAclCache.get(redis_client, room_uuid, user_id)
+
+        if owner_id is None:
+            async with use_session(session) as session:
+                repo = RoomRepository(session=session)
+
+                owner_id = await repo.get_owner_id(
+                    room_uuid=room_uuid
+                )
+
+            if owner_id is not None:
+                await RoomAclCache.set_owner(redis_client, room_uuid, owner_id)
+
+        if owner_id is not None and owner_id == user_id:
+            return "owner"
 
-            return True if updated_room else False
+        return permissions
 
     @staticmethod
-    async def get_by_room_uuid(room_uuid: str, owner_id: int) -> Optional[RoomRead]:
-        async with get_session() as session:
+    async def get_by_room_uuid(
+            room_uuid: str,
+            owner_id: int,
+            session: Optional[AsyncSession] = None
+    ) -> Optional[RoomRead]:
+        async with use_session(session) as session:
             repo = RoomRepository(session=session)
 
             room = await repo.get_by_room_uuid(
@@ -56,8 +103,27 @@ class RoomService:
             return room
 
     @staticmethod
-    async def get_by_room_info(room_uuid: str) -> Optional[RoomRead]:
-        async with get_session() as session:
+    async def get_room_version(
+            room_uuid: str,
+            owner_id: int,
+            session: Optional[AsyncSession] = None
+    ) -> Optional[datetime]:
+        async with use_session(session) as session:
+            repo = RoomRepository(session=session)
+
+            version = await repo.get_room_version(
+                room_uuid=room_uuid,
+                owner_id=owner_id
+            )
+
+            return version
+
+    @staticmethod
+    async def get_by_room_info(
+            room_uuid: str,
+            session: Optional[AsyncSession] = None
+    ) -> Optional[RoomRead]:
+        async with use_session(session) as session:
             repo = RoomRepository(session=session)
 
             room = await repo.get_by_room_info(
@@ -68,11 +134,18 @@ class RoomService:
         
     
     @staticmethod
-    async def get_all_by_owner(owner_id: int):
-        async with get_session() as session:
+    async def get_all_by_owner(
+            owner_id: int,
+            limit: int,
+            after: Optional[List[Any]] = None,
+            session: Optional[AsyncSession] = None
+    ) -> Page[RoomInfo]:
+        async with use_session(session) as session:
             repo = RoomRepository(session=session)
             rooms = await repo.get_all_by_owner(
-                owner_id=owner_id
+                owner_id=owner_id,
+                limit=limit,
+                after=after
             )
 
             return rooms
@@ -126,22 +199,29 @@ class RoomService:
             room_uuid: str,
             permissions: str
         ):
-        key = f"{room_uuid}:{invited_user_id}"
+        key = RoomAclCache.member_key(room_uuid, invited_user_id)
 
         await redis_client.set_value(
             key=key,
             value=permissions,
             expire=24 * 60 * 60
         )
+        RoomAclCache.set_member(room_uuid, invited_user_id, permissions)
 
     @staticmethod
     async def delete_invited_user(
         redis_client: AsyncRedisClient,
         username: int,
         room_uuid: str,
+        session: Optional[AsyncSession] = None
     ):
-        invited_user_id = await UserService.get_by_username(username=username)
-        key = f"{room_uuid}:{invited_user_id.id}"
+        invited_user_id = await UserService.get_by_username(
+            username=username,
+            redis_client=redis_client,
+            session=session
+        )
+        key = RoomAclCache.member_key(room_uuid, invited_user_id.id)
         await redis_client.delete_value(key=key)
+        RoomAclCache.drop_member(room_uuid, invited_user_id.id)
 
         return invited_user_id.id
@@ -1,11 +1,22 @@
-from database.core import get_session
+from typing import Optional
+
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.core import use_session
 from database.models.star.repository import StarRepository
+from services.cache import CatalogCache
+from services.redis_client import AsyncRedisClient
 
 
 class StarService:
     @staticmethod
-    async def create_star(template_name: str, user_id: int):
-        async with (get_session() as session):
+    async def create_star(
+        template_name: str,
+        user_id: int,
+        redis_client: AsyncRedisClient,
+        session: Optional[AsyncSession] = None
+    ):
+        async with use_session(session) as session:
             repo = StarRepository(session=session)
 
 
@@ -13,15 +24,32 @@ class StarService:
                 template_name=template_name,
                 user_id=user_id
             )
-            return new_star
+            await session.commit()
+
+        await StarService._invalidate_cache(redis_client, user_id)
+        return new_star
 
     @staticmethod
-    async def remove_star(template_name: str, user_id: int):
-        async with get_session() as session:
+    async def remove_star(
+        template_name: str,
+        user_id: int,
+        redis_client: AsyncRedisClient,
+        session: Optional[AsyncSession] = None
+    ):
+        async with use_session(session) as session:
             repo = StarRepository(session=session)
 
             new_star = await repo.remove_star(
                 template_name=template_name,
                 user_id=user_id
             )
-            return new_star
+            await session.commit()
+
+        if new_star:
+            await StarService._invalidate_cache(redis_client, user_id)
+        return new_star
+
+    @staticmethod
+    async def _invalidate_cache(redis_client: AsyncRedisClient, user_id: int):
+        await CatalogCache.bump_version(redis_client)
+        await CatalogCache.drop_starred(redis_client, user_id)
@@ -1,20 +1,38 @@
-from typing import Optional
+from datetime import datetime
+from typing import Any, List, Optional, Tuple
 
-from database.core import get_session
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.core import use_session
+from database.models.star.repository import StarRepository
 from database.models.template.repository import TemplateRepository
 from models.core.template import (
     TemplateRead,
     TemplateCreate,
     TemplateUpdate,
     TemplateBase,
-    AdditOwnerTemplatesInfo
+    AdditOwnerTemplatesInfo,
+    AdditPublicTemplatesInfo,
+    OwnerTemplatesInfo,
+    PublicTemplatesInfo,
+    PublicTemplateDetails,
+    PublicTemplateEntry,
+    TemplateOrder
 )
+from services.cache import CatalogCache
+from services.redis_client import AsyncRedisClient
+from utils.pagination import Page
 
 
 class TemplateService:
     @staticmethod
-    async def create_template(template_data: TemplateBase, owner_id: int) -> TemplateRead:
-        async with get_session() as session:
+    async def create_template(
+        template_data: TemplateBase,
+        owner_id: int,
+        redis_client: AsyncRedisClient,
+        session: Optional[AsyncSession] = None
+    ) -> TemplateRead:
+        async with use_session(session) as session:
             repo = TemplateRepository(session=session)
 
             template_model = TemplateCreate(
@@ -25,29 +43,39 @@ class TemplateService:
             new_template = await repo.create_template(
                 template_data=template_model
             )
-            return new_template
+            await session.commit()
+
+        await CatalogCache.bump_version(redis_client)
+        return new_template
 
     @staticmethod
     async def update_template(
         template_name: str,
         owner_id: int,
-        update_data: TemplateUpdate
+        update_data: TemplateUpdate,
+        redis_client: AsyncRedisClient,
+        session: Optional[AsyncSession] = None
     ) -> Optional[TemplateRead]:
-        async with get_session() as session:
+        async with use_session(session) as session:
             repo = TemplateRepository(session=session)
             updated_template = await repo.update_template(
                 template_name=template_name,
                 update_data=update_data,
                 owner_id=owner_id
             )
-            return updated_template
+            await session.commit()
+
+        if updated_template:
+            await CatalogCache.bump_version(redis_client)
+        return updated_template
 
     @staticmethod
     async def get_by_name(
         template_name: str,
-        owner_name: str
+        owner_name: str,
+        session: Optional[AsyncSession] = None
     ) -> Optional[AdditOwnerTemplatesInfo]:
-        async with get_session() as session:
+        async with use_session(session) as session:
             repo = TemplateRepository(session=session)
             template = await repo.get_by_name(
                 template_name=template_name,
@@ -56,32 +84,203 @@ class TemplateService:
             return template
 
     @staticmethod
-    async def get_public_template_info(
+    async def get_owner_template_version(
         template_name: str,
-        user_id: int,
-    ) -> Optional[AdditOwnerTemplatesInfo]:
-        async with get_session() as session:
+        owner_name: str,
+        session: Optional[AsyncSession] = None
+    ) -> Optional[Tuple[datetime, int]]:
+        async with use_session(session) as session:
             repo = TemplateRepository(session=session)
-            template = await repo.get_public_template_info(
+            version = await repo.get_owner_template_version(
                 template_name=template_name,
-                user_id=user_id
+                owner_name=owner_name
+            )
+            return version
+
+    @staticmethod
+    async def get_public_template_version(
+        template_name: str,
+        user_id: int,
+        redis_client: AsyncRedisClient,
+        session: Optional[AsyncSession] = None
+    ) -> Optional[Tuple[datetime, int, bool]]:
+        async with use_session(session) as session:
+            repo = TemplateRepository(session=session)
+            version = await repo.get_public_template_version(
+                template_name=template_name
+            )
+            if version is None:
+                return None
+
+            template_id, updated_at, stars_count = version
+            starred_flags = await TemplateService._get_starred_flags(
+                user_id=user_id,
+                template_ids=[template_id],
+                redis_client=redis_client,
+                session=session
+            )
+
+            return updated_at, stars_count, starred_flags[0]
+
+    @staticmethod
+    async def get_public_template_info(
+        template_name: str,
+        user_id: int,
+        redis_client: AsyncRedisClient,
+        session: Optional[AsyncSession] = None
+    ) -> Optional[AdditPublicTemplatesInfo]:
+        async with use_session(session) as session:
+            version = await CatalogCache.get_version(redis_client)
+            key = CatalogCache.make_key("public_template", version, template_name)
+
+            template = await CatalogCache.get(
+                redis_client=redis_client,
+                namespace="public_template",
+                key=key,
+                model=PublicTemplateDetails
+            )
+
+            if template is None:
+                repo = TemplateRepository(session=session)
+                template = await repo.get_public_template_info(
+                    template_name=template_name
+                )
+                if template is None:
+                    return None
+
+                await CatalogCache.set(redis_client, key, template)
+
+            starred_flags = await TemplateService._get_starred_flags(
+                user_id=user_id,
+                template_ids=[template.id],
+                redis_client=redis_client,
+                session=session
+            )
+
+            return AdditPublicTemplatesInfo(
+                **template.model_dump(exclude={"id"}),
+                starred_by_user=starred_flags[0]
             )
-            return template
 
     @staticmethod
-    async def get_all_by_owner(owner_id: int):
-        async with get_session() as session:
+    async def get_all_by_owner(
+        owner_id: int,
+        limit: int,
+        after: Optional[List[Any]] = None,
+        session: Optional[AsyncSession] = None
+    ) -> Page[OwnerTemplatesInfo]:
+        async with use_session(session) as session:
             repo = TemplateRepository(session=session)
             templates = await repo.get_all_by_owner(
-                owner_id=owner_id
+                owner_id=owner_id,
+                limit=limit,
+                after=after
             )
 
             return templates
 
     @staticmethod
-    async def get_all_public(user_id: int):
-        async with get_session() as session:
+    async def get_all_public(
+        user_id: int,
+        order: TemplateOrder,
+        limit: int,
+        redis_client: AsyncRedisClient,
+        after: Optional[List[Any]] = None,
+        session: Optional[AsyncSession] = None
+    ) -> Page[PublicTemplatesInfo]:
+        async with use_session(session) as session:
+            version = await CatalogCache.get_version(redis_client)
+            key = CatalogCache.make_key("public", version, order.value, limit, after)
+
+            templates = await CatalogCache.get(
+                redis_client=redis_client,
+                namespace="public",
+                key=key,
+                model=Page[PublicTemplateEntry]
+            )
+
+            if templates is None:
+                repo = TemplateRepository(session=session)
+                templates = await repo.get_all_public(
+                    order=order,
+                    limit=limit,
+                    after=after
+                )
+                await CatalogCache.set(redis_client, key, templates)
+
+            starred_flags = await TemplateService._get_starred_flags(
+                user_id=user_id,
+                template_ids=[template.id for template in templates.items],
+                redis_client=redis_client,
+                session=session
+            )
+
+            return Page[PublicTemplatesInfo](
+                items=[
+                    PublicTemplatesInfo(
+                        **template.model_dump(exclude={"id"}),
+                        starred_by_user=is_starred
+                    )
+                    for template, is_starred in zip(templates.items, starred_flags)
+                ],
+                next_cursor=templates.next_cursor
+            )
+
+    @staticmethod
+    async def search(
+        query_text: str,
+        user_id: int,
+        limit: int,
+        after: Optional[List[Any]] = None,
+        session: Optional[AsyncSession] = None
+    ) -> Page[PublicTemplatesInfo]:
+        async with use_session(session) as session:
             repo = TemplateRepository(session=session)
-            templates = await repo.get_all_public(user_id=user_id)
+            templates = await repo.search(
+                query_text=query_text,
+                user_id=user_id,
+                limit=limit,
+                after=after
+            )
 
             return templates
+
+    @staticmethod
+    async def reconcile_stars_count(session: Optional[AsyncSession] = None) -> int:
+        async with use_session(session) as session:
+            repo = TemplateRepository(session=session)
+            fixed = await repo.reconcile_stars_count()
+
+            return fixed
+
+    @staticmethod
+    async def _get_starred_flags(
+        user_id: Optional[int],
+        template_ids: List[int],
+        redis_client: AsyncRedisClient,
+        session: AsyncSession
+    ) -> List[bool]:
+        if user_id is None:
+            return [False] * len(template_ids)
+
+        version = await CatalogCache.get_starred_version(redis_client, user_id)
+        flags = await CatalogCache.get_starred_flags(
+            redis_client=redis_client,
+            user_id=user_id,
+            version=version,
+            template_ids=template_ids
+        )
+        if flags is not None:
+            return flags
+
+        repo = StarRepository(session=session)
+        starred_ids = await repo.get_starred_template_ids(user_id=user_id)
+        await CatalogCache.set_starred(
+            redis_client=redis_client,
+            user_id=user_id,
+            version=version,
+            template_ids=starred_ids
+        )
+
+        starred_ids = set(starred_ids)
+        return [template_id in starred_ids for template_id in template_ids]
@@ -1,30 +1,49 @@
 from typing import Optional
 
-from database.core import get_session
+from sqlalchemy.exc import IntegrityError
+from sqlalchemy.ext.asyncio import AsyncSession
+
+from database.core import use_session
 from database.models.user.repository import UserRepository
-from models.core.user import UserCreate, UserRead, UserLogin, UserUpdate
+from models.core.user import UserCreate, UserRead, UserLogin, UserUpdate, UserProfile
+from services.cache import UserCache
+from services.redis_client import AsyncRedisClient
 from utils.hash_manager import encrypt, get_password_hash
 
 
 class UserService:
     @staticmethod
-    async def create_user(user_data: UserCreate) -> UserRead:
-        async with get_session() as session:
+    async def create_user(
+        user_data: UserCreate,
+        session: Optional[AsyncSession] = None
+    ) -> Optional[UserRead]:
+        async with use_session(session) as session:
             repo = UserRepository(session=session)
 
+            if await repo.get_by_username(username=user_data.username):
+                return None
+
             user_data.password = await get_password_hash(
                 password=user_data.password
             )
 
-            new_user = await repo.create_user(
-                user_data=user_data
-            )
+            try:
+                new_user = await repo.create_user(
+                    user_data=user_data
+                )
+                await session.commit()
+            except IntegrityError:
+                await session.rollback()
+                return None
 
             return new_user
 
     @staticmethod
-    async def auth_user(credentials: UserLogin) -> Optional[UserRead]:
-        async with get_session() as session:
+    async def auth_user(
+        credentials: UserLogin,
+        session: Optional[AsyncSession] = None
+    ) -> Optional[UserRead]:
+        async with use_session(session) as session:
             repo = UserRepository(session=session)
 
             user = await repo.authenticate_user(
@@ -34,35 +53,70 @@ class UserService:
             return user
 
     @staticmethod
-    async def update_user(user_id: int, update_data: UserUpdate) -> bool:
-        async with get_session() as session:
+    async def update_user(
+        user_id: int,
+        update_data: UserUpdate,
+        redis_client: AsyncRedisClient,
+        session: Optional[AsyncSession] = None
+    ) -> bool:
+        async with use_session(session) as session:
             repo = UserRepository(session=session)
 
             updated_user = await repo.update_user_profile(
                 user_id=user_id,
                 update_data=update_data
             )
+            await session.commit()
 
-            return True if updated_user else False
+        await UserCache.invalidate(redis_client, user_id)
+        return True if updated_user else False
 
     @staticmethod
-    async def get_user(user_id: int):
-        async with get_session() as session:
+    async def get_user(
+        user_id: int,
+        redis_client: AsyncRedisClient,
+        session: Optional[AsyncSession] = None
+    ) -> Optional[UserProfile]:
+        current_user = await UserCache.get_by_id(redis_client, user_id)
+        if current_user is not None:
+            return current_user
+
+        async with use_session(session) as session:
             repo = UserRepository(session=session)
 
             current_user = await repo.get_user(
                 user_id=user_id
             )
 
-            return current_user
+        return await UserService._cache_user(redis_client, current_user)
 
     @staticmethod
-    async def get_by_username(username: int):
-        async with get_session() as session:
+    async def get_by_username(
+        username: str,
+        redis_client: AsyncRedisClient,
+        session: Optional[AsyncSession] = None
+    ) -> Optional[UserProfile]:
+        current_user = await UserCache.get_by_username(redis_client, username)
+        if current_user is not None:
+            return current_user
+
+        async with use_session(session) as session:
             repo = UserRepository(session=session)
 
             current_user = await repo.get_by_username(
                 username=username
             )
 
-            return current_user
+        return await UserService._cache_user(redis_client, current_user)
+
+    @staticmethod
+    async def _cache_user(
+        redis_client: AsyncRedisClient,
+        user: Optional[UserRead]
+    ) -> Optional[UserProfile]:
+        if user is None:
+            return None
+
+        profile = UserProfile.model_validate(user.model_dump(exclude={"password"}))
+        await UserCache.set(redis_client, profile)
+        return profile
@@ -0,0 +1,167 @@
+import asyncio
+import os
+import uuid
+from collections import OrderedDict
+from typing import Awaitable, Callable, Optional, Set
+
+from redis.asyncio import Redis
+
+
+FrameHandler = Callable[[str, bytes], Awaitable[None]]
+
+NODE_ID_SIZE = 16
+SEQUENCE_SIZE = 8
+HEADER_SIZE = NODE_ID_SIZE + SEQUENCE_SIZE
+
+
+class FanoutMetrics:
+    def __init__(self):
+        self.published = 0
+        self.received = 0
+        self.own = 0
+        self.duplicates = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "published": self.published,
+            "received": self.received,
+            "own": self.own,
+            "duplicates": self.duplicates
+        }
+
+
+class LocalFanout:
+    def __init__(self):
+        self.node_id = uuid.uuid4().bytes
+        self.metrics = FanoutMetrics()
+
+    async def start(self, handler: FrameHandler):
+        pass
+
+    async def subscribe(self, room_id: str):
+        pass
+
+    async def unsubscribe(self, room_id: str):
+        pass
+
+    async def publish(self, room_id: str, frame: bytes):
+        pass
+
+    async def close(self):
+        pass
+
+    def snapshot(self) -> dict:
+        return {
+            "backend": type(self).__name__,
+            "node_id": self.node_id.hex(),
+            **self.metrics.snapshot()
+        }
+
+
+class RedisFanout(LocalFanout):
+    CHANNEL_PREFIX = "collab:room:"
+
+    def __init__(self, url: str, dedup_size: int = 4096):
+        super().__init__()
+        self.redis = Redis.from_url(url)
+        self.pubsub = self.redis.pubsub()
+        self.handler: Optional[FrameHandler] = None
+        self.rooms: Set[str] = set()
+        self.sequence = 0
+        self.dedup_size = dedup_size
+        self._seen: OrderedDict[bytes, None] = OrderedDict()
+        self._listener: Optional[asyncio.Task] = None
+
+    def channel(self, room_id: str) -> str:
+        return f"{self.CHANNEL_PREFIX}{room_id}"
+
+    async def start(self, handler: FrameHandler):
+        self.handler = handler
+
+    async def subscribe(self, room_id: str):
+        if room_id in self.rooms:
+            return
+
+        self.rooms.add(room_id)
+        await self.pubsub.subscribe(self.channel(room_id))
+
+        if self._listener is None or self._listener.done():
+            self._listener = asyncio.create_task(self._listen())
+
+    async def unsubscribe(self, room_id: str):
+        if room_id not in self.rooms:
+            return
+
+        self.rooms.discard(room_id)
+        await self.pubsub.unsubscribe(self.channel(room_id))
+
+    async def publish(self, room_id: str, frame: bytes):
+        self.sequence += 1
+        envelope = b"".join((
+            self.node_id,
+            self.sequence.to_bytes(SEQUENCE_SIZE, "big"),
+            frame
+        ))
+        await self.redis.publish(self.channel(room_id), envelope)
+        self.metrics.published += 1
+
+    async def close(self):
+        if self._listener is not None:
+            self._listener.cancel()
+            await asyncio.gather(self._listener, return_exceptions=True)
+            self._listener = None
+
+        await self.pubsub.aclose()
+        await self.redis.aclose()
+
+    def _is_new(self, header: bytes) -> bool:
+        if header in self._seen:
+            return False
+
+        self._seen[header] = None
+        if len(self._seen) > self.dedup_size:
+            self._seen.popitem(last=False)
+        return True
+
+    async def _dispatch(self, channel: bytes, data: bytes):
+        if len(data) <= HEADER_SIZE:
+            return
+
+        if data[:NODE_ID_SIZE] == self.node_id:
+            self.metrics.own += 1
+            return
+
+        if not self._is_new(data[:HEADER_SIZE]):
+            self.metrics.duplicates += 1
+            return
+
+        self.metrics.received += 1
+        room_id = channel.decode()[len(self.CHANNEL_PREFIX):]
+        if self.handler is not None and room_id in self.rooms:
+            await self.handler(room_id, data[HEADER_SIZE:])
+
+    async def _listen(self):
+        while True:
+            try:
+                message = await self.pubsub.get_message(
+                    ignore_subscribe_messages=True,
+                    timeout=1.0
+                )
+                if message is not None and message["type"] == "message":
+                    await self._dispatch(message["channel"], message["data"])
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Fan-out listener error: {e}")
+                await asyncio.sleep(1)
+
+
+def create_fanout() -> LocalFanout:
+    backend = os.getenv("COLLAB_FANOUT", "local").lower()
+
+    if backend == "redis":
+        return RedisFanout(
+            url=os.getenv("REDIS_STORAGE", "redis://localhost:6379/0"),
+            dedup_size=int(os.getenv("COLLAB_FANOUT_DEDUP_SIZE", 4096))
+        )
+    return LocalFanout()
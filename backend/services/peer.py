@@ -0,0 +1,42 @@
+from time import monotonic
+from typing import Any, Optional, Set
+
+from starlette.websockets import WebSocket
+
+from services.send_queue import SendQueue
+
+
+class HeartbeatMetrics:
+    def __init__(self):
+        self.pings = 0
+        self.reaped = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "pings": self.pings,
+            "reaped": self.reaped
+        }
+
+
+heartbeat_metrics = HeartbeatMetrics()
+
+READ_ONLY = "read_only"
+
+
+class Peer:
+    def __init__(self, websocket: WebSocket, user_id: str, queue: SendQueue, permissions: Optional[str] = None):
+        self.websocket = websocket
+        self.user_id = user_id
+        self.queue = queue
+        self.permissions = permissions
+        self.read_only = permissions == READ_ONLY
+        self.group: Optional[Any] = None
+        self.awareness_ids: Set[int] = set()
+        self.synced = False
+        self.last_seen = monotonic()
+        self.pinged_at = 0.0
+
+    def send(self, frame: bytes) -> bool:
+        if self.group is not None:
+            return self.group.send_to(self.websocket, frame)
+        return self.queue.put(frame)
@@ -1,12 +1,16 @@
 import os
+from typing import Dict, List, Optional, Tuple
 from redis.asyncio import Redis, ConnectionPool
 
 
 class AsyncRedisClient:
+    _pool: Optional[ConnectionPool] = None
+
     def __init__(self):
         self.url = os.getenv('REDIS_STORAGE', "redis://localhost:6379/0")
-        pool = ConnectionPool.from_url(url=self.url, decode_responses=True)
-        self.redis = Redis.from_pool(connection_pool=pool)
+        if AsyncRedisClient._pool is None:
+            AsyncRedisClient._pool = ConnectionPool.from_url(url=self.url, decode_responses=True)
+        self.redis = Redis(connection_pool=AsyncRedisClient._pool)
 
     async def set_value(self, key: str, value: str, expire: int = None):
         await self.redis.set(key, value, ex=expire)
@@ -14,14 +18,74 @@ class AsyncRedisClient:
     async def get_value(self, key: str) -> str:
         return await self.redis.get(key)
 
+    async def get_values(self, keys: List[str]) -> List[Optional[str]]:
+        return await self.redis.mget(keys)
+
+    async def set_values(self, values: Dict[str, str], expire: int = None):
+        async with self.redis.pipeline(transaction=False) as pipe:
+            for key, value in values.items():
+                pipe.set(key, value, ex=expire)
+            await pipe.execute()
+
     async def delete_value(self, key: str):
         await self.redis.delete(key)
 
     async def exists_value(self, key: str):
         return await self.redis.exists(key)
 
+    async def incr_value(self, key: str) -> int:
+        return await self.redis.incr(key)
+
+    async def add_members(self, key: str, members: List[str], expire: int = None):
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.sadd(key, *members)
+            if expire:
+                pipe.expire(key, expire)
+            await pipe.execute()
+
+    async def check_members(self, key: str, members: List[str]) -> Optional[List[bool]]:
+        async with self.redis.pipeline(transaction=False) as pipe:
+            pipe.exists(key)
+            pipe.smismember(key, members)
+            is_exists, flags = await pipe.execute()
+
+        if not is_exists:
+            return None
+        return [bool(flag) for flag in flags]
+
+    async def set_if_absent(self, key: str, value: str, expire: int = None) -> bool:
+        return bool(await self.redis.set(key, value, ex=expire, nx=True))
+
+    async def append_stream(self, key: str, fields: Dict[str, str]) -> Tuple[str, int]:
+        async with self.redis.pipeline(transaction=True) as pipe:
+            pipe.xadd(key, fields)
+            pipe.xlen(key)
+            entry_id, length = await pipe.execute()
+        return entry_id, length
+
+    async def read_stream(
+            self,
+            key: str,
+            start: str = "-",
+            end: str = "+",
+            count: int = None
+    ) -> List[Tuple[str, Dict[str, str]]]:
+        return await self.redis.xrange(key, min=start, max=end, count=count)
+
+    async def read_stream_reverse(
+            self,
+            key: str,
+            end: str = "+",
+            start: str = "-",
+            count: int = None
+    ) -> List[Tuple[str, Dict[str, str]]]:
+        return await self.redis.xrevrange(key, max=end, min=start, count=count)
+
+    async def trim_stream(self, key: str, min_id: str) -> int:
+        return await self.redis.xtrim(key, minid=min_id, approximate=False)
+
     async def close(self):
-        return await self.redis.close()
+        return await self.redis.aclose()
 
 
 async def get_redis_client():
@@ -29,4 +93,4 @@ async def get_redis_client():
     try:
         yield client
     finally:
-        await client.redis.close()
+        await client.close()
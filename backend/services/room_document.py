@@ -0,0 +1,78 @@
+import asyncio
+from time import monotonic
+from typing import Iterable, List, Optional
+
+from pycrdt import Doc, Text, merge_updates
+
+from services.update_log import UpdateLog, update_log_metrics
+
+
+TEXT_NAME = "shared-text"
+EMPTY_UPDATE = b"\x00\x00"
+
+
+class RoomDocument:
+    def __init__(self, room_id: str, room_pk: Optional[int] = None):
+        self.room_id = room_id
+        self.room_pk = room_pk
+        self.doc = Doc()
+        self.pending: List[bytes] = []
+        self.flush_lock = asyncio.Lock()
+        self.log = UpdateLog()
+        self.held_since: Optional[int] = None
+        self.last_active = monotonic()
+        self._state_size: Optional[int] = None
+        self._measured_seq = 0
+        self._changes: List[bytes] = []
+        self._subscription = self.doc.observe(lambda event: self._changes.append(event.update))
+
+    def load(self, updates: Iterable[bytes]):
+        for update in updates:
+            self.doc.apply_update(bytes(update))
+        self._changes.clear()
+
+    def apply_update(self, update: bytes) -> bytes:
+        self.doc.apply_update(bytes(update))
+
+        changes, self._changes = self._changes, []
+        if len(changes) > 1:
+            effective = merge_updates(*changes)
+        else:
+            effective = changes[0] if changes else EMPTY_UPDATE
+
+        if effective == EMPTY_UPDATE:
+            update_log_metrics.redundant += 1
+            update_log_metrics.redundant_bytes += len(update)
+            return EMPTY_UPDATE
+
+        self.log.append(effective)
+        return effective
+
+    def touch(self):
+        self.last_active = monotonic()
+
+    def memory_usage(self) -> int:
+        if self._state_size is None or self._measured_seq != self.log.seq:
+            self._state_size = len(self.doc.get_update())
+            self._measured_seq = self.log.seq
+        return self._state_size + self.log.size + sum(len(update) for update in self.pending)
+
+    def get_state(self) -> bytes:
+        return self.doc.get_state()
+
+    def get_update(self, state_vector: bytes = None) -> bytes:
+        return self.doc.get_update(bytes(state_vector) if state_vector is not None else None)
+
+    def get_update_since(self, seq: int) -> bytes:
+        updates = self.log.since(seq)
+        if updates is None:
+            update_log_metrics.catch_up_full += 1
+            return self.get_update()
+
+        update_log_metrics.catch_up_log += 1
+        if not updates:
+            return EMPTY_UPDATE
+        return merge_updates(*updates) if len(updates) > 1 else updates[0]
+
+    def get_text(self) -> str:
+        return str(self.doc.get(TEXT_NAME, type=Text))
@@ -0,0 +1,85 @@
+import os
+from collections import OrderedDict
+from time import monotonic
+from typing import Container, List, Optional
+
+from services.room_document import RoomDocument
+
+
+class RoomRegistry:
+    MEMORY_BUDGET = int(os.getenv("COLLAB_ROOM_MEMORY_BUDGET", 256 * 1024 * 1024))
+    IDLE_TTL = float(os.getenv("COLLAB_ROOM_IDLE_TTL", 300))
+
+    def __init__(self, memory_budget: Optional[int] = None, idle_ttl: Optional[float] = None):
+        self.memory_budget = RoomRegistry.MEMORY_BUDGET if memory_budget is None else memory_budget
+        self.idle_ttl = RoomRegistry.IDLE_TTL if idle_ttl is None else idle_ttl
+        self.documents: OrderedDict[str, RoomDocument] = OrderedDict()
+        self.loaded = 0
+        self.evicted = 0
+
+    def get(self, room_id: str) -> Optional[RoomDocument]:
+        document = self.documents.get(room_id)
+        if document is not None:
+            document.touch()
+            self.documents.move_to_end(room_id)
+        return document
+
+    def peek(self, room_id: str) -> Optional[RoomDocument]:
+        return self.documents.get(room_id)
+
+    def add(self, document: RoomDocument):
+        self.documents[document.room_id] = document
+        self.loaded += 1
+
+    def remove(self, room_id: str):
+        if self.documents.pop(room_id, None) is not None:
+            self.evicted += 1
+
+    def values(self) -> List[RoomDocument]:
+        return list(self.documents.values())
+
+    def __getitem__(self, room_id: str) -> RoomDocument:
+        return self.documents[room_id]
+
+    def __contains__(self, room_id: str) -> bool:
+        return room_id in self.documents
+
+    def __len__(self) -> int:
+        return len(self.documents)
+
+    def memory_usage(self) -> int:
+        return sum(document.memory_usage() for document in self.documents.values())
+
+    def eviction_candidates(self, active: Container[str]) -> List[RoomDocument]:
+        now = monotonic()
+        usage = self.memory_usage()
+        candidates = []
+
+        for document in self.documents.values():
+            if document.room_id in active:
+                continue
+
+            if now - document.last_active >= self.idle_ttl or usage > self.memory_budget:
+                candidates.append(document)
+                usage -= document.memory_usage()
+
+        return candidates
+
+    def snapshot(self, active: Container[str], top: int = 10) -> dict:
+        usage = {room_id: document.memory_usage() for room_id, document in self.documents.items()}
+        largest = sorted(usage.items(), key=lambda item: item[1], reverse=True)[:top]
+        active_count = sum(1 for room_id in self.documents if room_id in active)
+
+        return {
+            "loaded": len(self.documents),
+            "active": active_count,
+            "idle": len(self.documents) - active_count,
+            "memory_bytes": sum(usage.values()),
+            "memory_budget": self.memory_budget,
+            "loaded_total": self.loaded,
+            "evicted_total": self.evicted,
+            "largest": [
+                {"room_id": room_id, "bytes": size, "active": room_id in active}
+                for room_id, size in largest
+            ]
+        }
@@ -0,0 +1,151 @@
+import asyncio
+import os
+import weakref
+from collections import deque
+from typing import Any, Awaitable, Callable, Deque, List, Optional
+
+
+DROP = "drop"
+COALESCE = "coalesce"
+DISCONNECT = "disconnect"
+
+
+class SendQueueMetrics:
+    def __init__(self):
+        self.queues = weakref.WeakSet()
+        self.enqueued = 0
+        self.sent = 0
+        self.dropped = 0
+        self.coalesced = 0
+        self.resynced = 0
+        self.disconnected = 0
+        self.errors = 0
+        self.depth_max = 0
+
+    def snapshot(self) -> dict:
+        depths = [queue.depth for queue in list(self.queues)]
+        return {
+            "queues": len(depths),
+            "depth_total": sum(depths),
+            "depth_max": max(depths, default=0),
+            "depth_max_seen": self.depth_max,
+            "enqueued": self.enqueued,
+            "sent": self.sent,
+            "dropped": self.dropped,
+            "coalesced": self.coalesced,
+            "resynced": self.resynced,
+            "disconnected": self.disconnected,
+            "errors": self.errors
+        }
+
+
+send_queue_metrics = SendQueueMetrics()
+
+
+class SendQueue:
+    MAXSIZE = int(os.getenv("COLLAB_SEND_QUEUE_SIZE", 256))
+    POLICY = os.getenv("COLLAB_SLOW_CONSUMER_POLICY", COALESCE).lower()
+
+    def __init__(
+            self,
+            send: Callable[[Any], Awaitable],
+            maxsize: Optional[int] = None,
+            policy: Optional[str] = None,
+            coalesce: Optional[Callable[[List[Any]], List[Any]]] = None,
+            resync: Optional[Callable[[Any], Any]] = None,
+            mark: Optional[Callable[[], Any]] = None,
+            on_close: Optional[Callable[[str], Awaitable]] = None
+    ):
+        self.send = send
+        self.maxsize = maxsize or SendQueue.MAXSIZE
+        self.policy = policy or SendQueue.POLICY
+        self.coalesce = coalesce
+        self.resync = resync
+        self.mark = mark
+        self.on_close = on_close
+        self.frames: Deque[Any] = deque()
+        self.stale = False
+        self.stale_mark: Any = None
+        self.closed = False
+        self._ready = asyncio.Event()
+        self._writer = asyncio.create_task(self._run())
+        send_queue_metrics.queues.add(self)
+
+    @property
+    def depth(self) -> int:
+        return len(self.frames)
+
+    def put(self, frame: Any) -> bool:
+        if self.closed:
+            return False
+
+        if len(self.frames) >= self.maxsize:
+            return self._overflow(frame)
+
+        self.frames.append(frame)
+        send_queue_metrics.enqueued += 1
+        send_queue_metrics.depth_max = max(send_queue_metrics.depth_max, len(self.frames))
+        self._ready.set()
+        return True
+
+    def close(self):
+        self.closed = True
+        self.frames.clear()
+        self._writer.cancel()
+
+    def _overflow(self, frame: Any) -> bool:
+        if self.policy == COALESCE and self.coalesce is not None:
+            coalesced = self.coalesce([*self.frames, frame])
+            if len(coalesced) < self.maxsize:
+                send_queue_metrics.coalesced += len(self.frames) + 1 - len(coalesced)
+                self.frames = deque(coalesced)
+                self._ready.set()
+                return True
+
+        if self.policy == DISCONNECT:
+            send_queue_metrics.disconnected += 1
+            self._shutdown("slow consumer")
+            return False
+
+        send_queue_metrics.dropped += 1
+        if self.resync is not None:
+            self.mark_stale(self.mark() if self.mark is not None else None)
+        return False
+
+    def mark_stale(self, mark: Any):
+        if self.closed or self.resync is None:
+            return
+
+        if not self.stale or mark is None or (self.stale_mark is not None and mark < self.stale_mark):
+            self.stale_mark = mark
+        self.stale = True
+        self._ready.set()
+
+    def _shutdown(self, reason: str):
+        self.close()
+        if self.on_close is not None:
+            asyncio.ensure_future(self.on_close(reason))
+
+    async def _run(self):
+        while True:
+            if not self.frames:
+                if self.stale:
+                    self.stale = False
+                    send_queue_metrics.resynced += 1
+                    self.frames.append(self.resync(self.stale_mark))
+                    continue
+
+                self._ready.clear()
+                await self._ready.wait()
+                continue
+
+            try:
+                await self.send(self.frames.popleft())
+                send_queue_metrics.sent += 1
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                print(f"Send error: {e}")
+                send_queue_metrics.errors += 1
+                self._shutdown("send failed")
+                return
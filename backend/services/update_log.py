@@ -0,0 +1,64 @@
+import os
+from collections import deque
+from typing import Deque, List, NamedTuple, Optional
+
+
+class UpdateLogMetrics:
+    def __init__(self):
+        self.appended = 0
+        self.evicted = 0
+        self.redundant = 0
+        self.redundant_bytes = 0
+        self.catch_up_log = 0
+        self.catch_up_full = 0
+
+    def snapshot(self) -> dict:
+        return {
+            "appended": self.appended,
+            "evicted": self.evicted,
+            "redundant": self.redundant,
+            "redundant_bytes": self.redundant_bytes,
+            "catch_up_log": self.catch_up_log,
+            "catch_up_full": self.catch_up_full
+        }
+
+
+update_log_metrics = UpdateLogMetrics()
+
+
+class LoggedUpdate(NamedTuple):
+    seq: int
+    update: bytes
+
+
+class UpdateLog:
+    MAX_ENTRIES = int(os.getenv("COLLAB_UPDATE_LOG_SIZE", 512))
+    MAX_BYTES = int(os.getenv("COLLAB_UPDATE_LOG_BYTES", 1024 * 1024))
+
+    def __init__(self, max_entries: Optional[int] = None, max_bytes: Optional[int] = None):
+        self.max_entries = max_entries or UpdateLog.MAX_ENTRIES
+        self.max_bytes = max_bytes or UpdateLog.MAX_BYTES
+        self.entries: Deque[LoggedUpdate] = deque()
+        self.seq = 0
+        self.size = 0
+
+    @property
+    def first_seq(self) -> int:
+        return self.entries[0].seq if self.entries else self.seq + 1
+
+    def append(self, update: bytes) -> int:
+        self.seq += 1
+        self.entries.append(LoggedUpdate(self.seq, update))
+        self.size += len(update)
+        update_log_metrics.appended += 1
+
+        while len(self.entries) > self.max_entries or (len(self.entries) > 1 and self.size > self.max_bytes):
+            self.size -= len(self.entries.popleft().update)
+            update_log_metrics.evicted += 1
+
+        return self.seq
+
+    def since(self, seq: int) -> Optional[List[bytes]]:
+        if seq < self.first_seq:
+            return None
+        return [entry.update for entry in self.entries if entry.seq >= seq]
@@ -0,0 +1,45 @@
+from typing import Optional
+
+from fastapi import HTTPException, Request
+
+from models.api.token import TokenPrincipal
+from utils.jwt_manager import decode_access_token
+
+
+async def _get_access_token(request: Request) -> Optional[str]:
+    authorization = request.headers.get("authorization", "")
+    if authorization.lower().startswith("bearer "):
+        return authorization[7:].strip()
+
+    token = request.query_params.get("access_token")
+    if token:
+        return token
+
+    if "json" not in request.headers.get("content-type", ""):
+        return None
+
+    try:
+        body = await request.json()
+    except ValueError:
+        return None
+
+    return body.get("access_token") if isinstance(body, dict) else None
+
+
+async def get_principal(request: Request) -> TokenPrincipal:
+    principal = getattr(request.state, "principal", None)
+    if principal is not None:
+        return principal
+
+    token = await _get_access_token(request)
+    token_data = decode_access_token(token=token) if token else None
+
+    if not token_data or token_data.get("user_id") is None:
+        raise HTTPException(status_code=401, detail="Invalid access token")
+
+    principal = TokenPrincipal(
+        user_id=token_data["user_id"],
+        username=token_data.get("username", "")
+    )
+    request.state.principal = principal
+    return principal
@@ -1,8 +1,10 @@
-from typing import Type, TypeVar, Generic, Optional, List, Dict, Any
-from sqlalchemy import insert, select, update, delete, func
+from typing import Type, TypeVar, Generic, Optional, List, Dict, Any, Sequence, Tuple
+from sqlalchemy import insert, select, update, delete, func, tuple_, Select, ColumnElement
 from sqlalchemy.ext.asyncio import AsyncSession
 from pydantic import BaseModel
-from sqlalchemy.orm import DeclarativeBase
+from sqlalchemy.orm import DeclarativeBase, InstrumentedAttribute, load_only
+
+from utils.pagination import encode_cursor
 
 T = TypeVar('T', bound=DeclarativeBase)
 M = TypeVar('M', bound=BaseModel)
@@ -16,6 +18,13 @@ class BaseRepository(Generic[T, M]):
         self.session = session
         self.model = model
 
+    def select(self, *columns: InstrumentedAttribute) -> Select:
+        query = select(self.model)
+
+        if columns:
+            query = query.options(load_only(*columns, raiseload=True))
+        return query
+
     async def create(
             self,
             data: CreateSchema,
@@ -27,7 +36,6 @@ class BaseRepository(Generic[T, M]):
             .returning(self.model)
         )
         result = await self.session.execute(stmt)
-        await self.session.commit()
         record = result.scalar_one()
         return returning_model.model_validate(record)
 
@@ -57,6 +65,34 @@ class BaseRepository(Generic[T, M]):
         )
         return [returning_model.model_validate(r) for r in result.scalars()]
 
+    async def paginate(
+            self,
+            query: Select,
+            order_by: Sequence[ColumnElement],
+            order: str,
+            limit: int,
+            after: Optional[Sequence[Any]] = None
+    ) -> Tuple[List[tuple], Optional[str]]:
+        if after:
+            query = query.where(tuple_(*order_by) < tuple(after))
+
+        result = await self.session.execute(
+            query
+            .add_columns(*order_by)
+            .order_by(*(column.desc() for column in order_by))
+            .limit(limit + 1)
+        )
+        rows = result.all()
+
+        key_size = len(order_by)
+        next_cursor = None
+
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = encode_cursor(order, list(rows[-1][-key_size:]))
+
+        return [tuple(row[:-key_size]) for row in rows], next_cursor
+
     async def update(
             self,
             update_id: int,
@@ -70,7 +106,6 @@ class BaseRepository(Generic[T, M]):
             .returning(self.model)
         )
         result = await self.session.execute(stmt)
-        await self.session.commit()
         record = result.scalar_one_or_none()
         return returning_model.model_validate(record) if record else None
 
@@ -81,7 +116,6 @@ class BaseRepository(Generic[T, M]):
             .returning(self.model.id)
         )
         result = await self.session.execute(stmt)
-        await self.session.commit()
         return result.scalar_one_or_none() is not None
 
     async def exists(self, **filters) -> bool:
@@ -1,7 +1,109 @@
+import asyncio
 import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor
+from time import perf_counter
+from typing import Callable, Optional, TypeVar
+
 import bcrypt
 
 
+T = TypeVar("T")
+
+
+class HashMetrics:
+    def __init__(self):
+        self.calls = 0
+        self.queued = 0
+        self.running = 0
+        self.queued_max = 0
+        self.wait_total = 0.0
+        self.wait_max = 0.0
+        self.run_total = 0.0
+        self.run_max = 0.0
+
+    def enqueue(self):
+        self.queued += 1
+        self.queued_max = max(self.queued_max, self.queued)
+
+    def start(self, waited: float):
+        self.queued -= 1
+        self.running += 1
+        self.wait_total += waited
+        self.wait_max = max(self.wait_max, waited)
+
+    def finish(self, elapsed: float):
+        self.running -= 1
+        self.calls += 1
+        self.run_total += elapsed
+        self.run_max = max(self.run_max, elapsed)
+
+    def snapshot(self) -> dict:
+        return {
+            "workers": HASH_MAX_WORKERS,
+            "calls": self.calls,
+            "queued": self.queued,
+            "queued_max": self.queued_max,
+            "running": self.running,
+            "wait_avg_ms": self.wait_total / self.calls * 1000 if self.calls else 0.0,
+            "wait_max_ms": self.wait_max * 1000,
+            "run_avg_ms": self.run_total / self.calls * 1000 if self.calls else 0.0,
+            "run_max_ms": self.run_max * 1000,
+        }
+
+
+HASH_MAX_WORKERS = int(os.getenv("BCRYPT_MAX_WORKERS", min(4, os.cpu_count() or 1)))
+
+hash_metrics = HashMetrics()
+
+_executor: Optional[ThreadPoolExecutor] = None
+_semaphore: Optional[asyncio.Semaphore] = None
+
+
+def _get_executor() -> ThreadPoolExecutor:
+    global _executor, _semaphore
+
+    if _executor is None:
+        _executor = ThreadPoolExecutor(
+            max_workers=HASH_MAX_WORKERS,
+            thread_name_prefix="bcrypt"
+        )
+        _semaphore = asyncio.Semaphore(HASH_MAX_WORKERS)
+
+    return _executor
+
+
+def shutdown_hash_executor() -> None:
+    global _executor, _semaphore
+
+    if _executor is not None:
+        _executor.shutdown(wait=False, cancel_futures=True)
+
+    _executor = None
+    _semaphore = None
+
+
+async def _run_bounded(func: Callable[..., T], *args) -> T:
+    executor = _get_executor()
+    semaphore = _semaphore
+    queued_at = perf_counter()
+    hash_metrics.enqueue()
+
+    try:
+        await semaphore.acquire()
+    except BaseException:
+        hash_metrics.queued -= 1
+        raise
+
+    started = perf_counter()
+    hash_metrics.start(started - queued_at)
+    try:
+        return await asyncio.get_running_loop().run_in_executor(executor, func, *args)
+    finally:
+        hash_metrics.finish(perf_counter() - started)
+        semaphore.release()
+
+
 async def encrypt(input_string: str) -> str:
     sha256_hash = hashlib.sha256()
 
@@ -13,8 +115,8 @@ async def encrypt(input_string: str) -> str:
 
 
 async def get_password_hash(password: str) -> bytes:
-    return bcrypt.hashpw(password.encode(), bcrypt.gensalt())
+    return await _run_bounded(bcrypt.hashpw, password.encode(), bcrypt.gensalt())
 
 
 async def check_password(password: str, hashed_password: bytes) -> bool:
-    return bcrypt.checkpw(password.encode(), hashed_password)
+    return await _run_bounded(bcrypt.checkpw, password.encode(), hashed_password)
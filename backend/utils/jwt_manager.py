@@ -1,28 +1,67 @@
 from datetime import datetime, timedelta, timezone
+from typing import Optional, Tuple
+import hashlib
 import jwt
 import os
 
+from utils.ttl_cache import TTLCache
+
+
+_settings: Optional[Tuple[str, str]] = None
+
+token_cache: TTLCache[str, dict] = TTLCache(
+    maxsize=int(os.getenv("JWT_CACHE_SIZE", 10_000))
+)
+
+
+def load_jwt_settings() -> Tuple[str, str]:
+    global _settings
+
+    _settings = (
+        os.getenv("SECRET_KEY", "key)"),
+        os.getenv("ALGORITHM", "HS256")
+    )
+    token_cache.clear()
+    return _settings
+
+
+def get_jwt_settings() -> Tuple[str, str]:
+    return _settings or load_jwt_settings()
+
 
 def create_access_token(data: dict) -> str:
+    secret_key, algorithm = get_jwt_settings()
+
     to_encode = data.copy()
     expire = datetime.now(timezone.utc) + timedelta(days=7)
     to_encode.update({"exp": expire})
     encoded_jwt = jwt.encode(
         payload=to_encode,
-        key=os.getenv("SECRET_KEY", "key)"),
-        algorithm=os.getenv("ALGORITHM", "HS256")
+        key=secret_key,
+        algorithm=algorithm
     )
     return encoded_jwt
 
 
 def decode_access_token(token: str) -> dict | None:
+    digest = hashlib.sha256(token.encode()).hexdigest()
+
+    cached = token_cache.get(digest)
+    if cached is not None:
+        return cached
+
+    secret_key, algorithm = get_jwt_settings()
+
     try:
         decoded_token = jwt.decode(
             token,
-            os.getenv("SECRET_KEY", "key)"),
-            algorithms=[os.getenv("ALGORITHM", "HS256")]
+            secret_key,
+            algorithms=[algorithm]
         )
-
-        return decoded_token
     except Exception:
         return None
+
+    if "exp" in decoded_token:
+        token_cache.set(digest, decoded_token, expires_at=float(decoded_token["exp"]))
+
+    return decoded_token
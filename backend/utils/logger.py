@@ -7,8 +7,9 @@ class Logger:
         self.logger.setLevel(level)
         self.name = name
 
-        handler = logging.FileHandler(f"{name}.log", mode='a')
-        self.logger.addHandler(handler)
+        if not self.logger.handlers:
+            handler = logging.FileHandler(f"{name}.log", mode='a')
+            self.logger.addHandler(handler)
 
     def debug(self, msg: str):
         self.logger.debug(msg=msg)
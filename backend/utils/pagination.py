@@ -0,0 +1,88 @@
+import base64
+import json
+from datetime import datetime
+from typing import Any, Dict, Generic, List, Optional, Tuple, TypeVar
+
+from fastapi import HTTPException, Query
+from pydantic import BaseModel
+
+T = TypeVar('T')
+
+CURSOR_TYPES: Dict[str, Tuple[type, ...]] = {
+    "updated": (datetime, int),
+    "stars": (int, int),
+    "rank": (float, int),
+}
+
+
+class Page(BaseModel, Generic[T]):
+    items: List[T]
+    next_cursor: Optional[str] = None
+
+
+def _encode_value(value: Any) -> Any:
+    if isinstance(value, datetime):
+        return {"dt": value.isoformat()}
+    return value
+
+
+def _decode_value(value: Any) -> Any:
+    if isinstance(value, dict) and "dt" in value:
+        return datetime.fromisoformat(value["dt"])
+    return value
+
+
+def _matches_type(value: Any, expected: type) -> bool:
+    if isinstance(value, bool):
+        return False
+    if expected is float:
+        return isinstance(value, (int, float))
+    return isinstance(value, expected)
+
+
+def encode_cursor(order: str, values: List[Any]) -> str:
+    payload = json.dumps(
+        {"o": order, "v": [_encode_value(value) for value in values]},
+        separators=(",", ":")
+    )
+    return base64.urlsafe_b64encode(payload.encode()).decode().rstrip("=")
+
+
+def decode_cursor(cursor: str) -> tuple[str, List[Any]]:
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        payload = json.loads(base64.urlsafe_b64decode(padded.encode()))
+        return payload["o"], [_decode_value(value) for value in payload["v"]]
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+
+class PageParams:
+    def __init__(
+            self,
+            limit: int = Query(default=50, ge=1, le=200),
+            cursor: Optional[str] = Query(default=None)
+    ):
+        self.limit = limit
+        self.cursor = cursor
+
+    def after(self, order: str) -> Optional[List[Any]]:
+        if not self.cursor:
+            return None
+
+        try:
+            cursor_order, values = decode_cursor(self.cursor)
+        except ValueError:
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        if cursor_order != order:
+            raise HTTPException(status_code=400, detail="Cursor does not match order")
+
+        types = CURSOR_TYPES.get(order)
+        if types is not None and (
+                len(values) != len(types) or
+                not all(_matches_type(value, expected) for value, expected in zip(values, types))
+        ):
+            raise HTTPException(status_code=400, detail="Invalid cursor")
+
+        return values
@@ -0,0 +1,113 @@
+from typing import List, NamedTuple, Optional, Tuple
+
+MESSAGE_SYNC = 0
+MESSAGE_AWARENESS = 1
+MESSAGE_QUERY_AWARENESS = 3
+
+SYNC_STEP1 = 0
+SYNC_STEP2 = 1
+SYNC_UPDATE = 2
+
+
+class YMessage(NamedTuple):
+    message_type: int
+    sync_type: Optional[int]
+    payload: memoryview
+
+
+def read_var_uint(data: memoryview, offset: int = 0) -> Tuple[int, int]:
+    value = 0
+    shift = 0
+    while True:
+        byte = data[offset]
+        offset += 1
+        value |= (byte & 0x7F) << shift
+        if byte < 0x80:
+            return value, offset
+        shift += 7
+
+
+def read_var_bytes(data: memoryview, offset: int = 0) -> Tuple[memoryview, int]:
+    length, offset = read_var_uint(data, offset)
+    end = offset + length
+    if end > len(data):
+        raise ValueError("Truncated message")
+    return data[offset:end], end
+
+
+def write_var_uint(value: int) -> bytes:
+    out = bytearray()
+    while value > 0x7F:
+        out.append((value & 0x7F) | 0x80)
+        value >>= 7
+    out.append(value)
+    return bytes(out)
+
+
+def parse_message(data: bytes) -> YMessage:
+    view = memoryview(data)
+    try:
+        message_type, offset = read_var_uint(view)
+        if message_type != MESSAGE_SYNC:
+            return YMessage(message_type, None, view[offset:])
+
+        sync_type, offset = read_var_uint(view, offset)
+        payload, _ = read_var_bytes(view, offset)
+        return YMessage(message_type, sync_type, payload)
+    except IndexError:
+        raise ValueError("Truncated message")
+
+
+def encode_sync(sync_type: int, payload: bytes) -> bytes:
+    return b"".join((
+        write_var_uint(MESSAGE_SYNC),
+        write_var_uint(sync_type),
+        write_var_uint(len(payload)),
+        payload
+    ))
+
+
+def encode_sync_step1(state_vector: bytes) -> bytes:
+    return encode_sync(SYNC_STEP1, state_vector)
+
+
+def encode_sync_step2(update: bytes) -> bytes:
+    return encode_sync(SYNC_STEP2, update)
+
+
+def encode_update(update: bytes) -> bytes:
+    return encode_sync(SYNC_UPDATE, update)
+
+
+def write_var_bytes(payload: bytes) -> bytes:
+    return write_var_uint(len(payload)) + payload
+
+
+def parse_awareness(payload: memoryview) -> List[Tuple[int, int, bytes]]:
+    try:
+        update, _ = read_var_bytes(payload)
+        count, offset = read_var_uint(update)
+        entries = []
+        for _ in range(count):
+            client_id, offset = read_var_uint(update, offset)
+            clock, offset = read_var_uint(update, offset)
+            state, offset = read_var_bytes(update, offset)
+            entries.append((client_id, clock, bytes(state)))
+        return entries
+    except IndexError:
+        raise ValueError("Truncated awareness update")
+
+
+def encode_awareness(entries: List[Tuple[int, int, bytes]]) -> bytes:
+    update = b"".join([
+        write_var_uint(len(entries)),
+        *(
+            write_var_uint(client_id) + write_var_uint(clock) + write_var_bytes(state)
+            for client_id, clock, state in entries
+        )
+    ])
+    return write_var_uint(MESSAGE_AWARENESS) + write_var_bytes(update)
+
+
+def encode_query_awareness() -> bytes:
+    return write_var_uint(MESSAGE_QUERY_AWARENESS)
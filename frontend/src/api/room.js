@@ -2,6 +2,8 @@ import { message } from 'antd';
 
 const API_URL = 'http://localhost:8000/api/v1/room';
 
+const cursorParam = (cursor) => (cursor ? `&cursor=${encodeURIComponent(cursor)}` : '');
+
 export const createRoom = async (access_token, roomData) => {
   try {
     const response = await fetch(`${API_URL}/create`, {
@@ -80,10 +82,10 @@ export const getRoomInfo = async (access_token, room_uuid) => {
   }
 };
 
-export const fetchUserRooms = async (access_token) => {
+export const fetchUserRooms = async (access_token, cursor = null) => {
   try {
     const response = await fetch(
-      `${API_URL}/my?access_token=${access_token}`,
+      `${API_URL}/my?access_token=${access_token}${cursorParam(cursor)}`,
       {
         headers: {
           'accept': 'application/json'
@@ -97,12 +99,10 @@ export const fetchUserRooms = async (access_token) => {
     }
     
     const data = await response.json();    
-    return data;
+    return { items: data.items, next_cursor: data.next_cursor };
   } catch (error) {
     message.error(error.message);
-    return { 
-      rooms: []
-    };
+    return { items: [], next_cursor: null };
   }
 };
 
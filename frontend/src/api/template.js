@@ -2,10 +2,12 @@ import { message } from 'antd';
 
 const API_URL = 'http://localhost:8000/api/v1/template';
 
-export const fetchMyTemplates = async (access_token) => {
+const cursorParam = (cursor) => (cursor ? `&cursor=${encodeURIComponent(cursor)}` : '');
+
+export const fetchMyTemplates = async (access_token, cursor = null) => {
   try {
     const response = await fetch(
-      `${API_URL}/my?access_token=${access_token}`,
+      `${API_URL}/my?access_token=${access_token}${cursorParam(cursor)}`,
       {
         headers: {
           'accept': 'application/json'
@@ -18,18 +20,16 @@ export const fetchMyTemplates = async (access_token) => {
     }
     
     const data = await response.json();    
-    return data;
+    return { items: data.items, next_cursor: data.next_cursor };
   } catch (error) {
     message.error(error.message);
-    return { 
-      templates: [],
-    };
+    return { items: [], next_cursor: null };
   }
 };
-export const fetchPublicTemplates = async (access_token) => {
+export const fetchPublicTemplates = async (access_token, cursor = null) => {
   try {
     const response = await fetch(
-      `${API_URL}/public?access_token=${access_token}`,
+      `${API_URL}/public?access_token=${access_token}${cursorParam(cursor)}`,
       {
         headers: {
           'accept': 'application/json'
@@ -42,12 +42,33 @@ export const fetchPublicTemplates = async (access_token) => {
     }
     
     const data = await response.json();
-    return data;
+    return { items: data.items, next_cursor: data.next_cursor };
+  } catch (error) {
+    message.error(error.message);
+    return { items: [], next_cursor: null };
+  }
+};
+
+export const searchTemplates = async (access_token, query, cursor = null) => {
+  try {
+    const response = await fetch(
+      `${API_URL}/search?q=${encodeURIComponent(query)}&access_token=${access_token}${cursorParam(cursor)}`,
+      {
+        headers: {
+          'accept': 'application/json'
+        }
+      }
+    );
+    if (!response.ok) {
+      const errorData = await response.json();
+      throw new Error(errorData.message || 'Ошибка поиска шаблонов');
+    }
+
+    const data = await response.json();
+    return { items: data.items, next_cursor: data.next_cursor };
   } catch (error) {
     message.error(error.message);
-    return { 
-      templates: [],
-    };
+    return { items: [], next_cursor: null };
   }
 };
 
@@ -37,8 +37,8 @@ export default function TemplateManager() {
     
     setLoading(true);
     try {
-      const data = await fetchMyTemplates(token);
-      setTemplates(data || []);
+      const page = await fetchMyTemplates(token);
+      setTemplates(page.items || []);
     } catch (error) {
       message.error('Ошибка загрузки шаблонов');
     } finally {
@@ -23,7 +23,7 @@ import {
   EyeOutlined,
   UserOutlined
 } from '@ant-design/icons';
-import { fetchMyTemplates, fetchPublicTemplates, getPublicTemplateInfo } from '../../api/template';
+import { fetchMyTemplates, fetchPublicTemplates, getPublicTemplateInfo, searchTemplates } from '../../api/template';
 import { starTemplate, unstarTemplate } from '../../api/star';
 import useAuthStore from '../../store/authStores';
 import { TemplateUpdater } from './TemplateUpdater';
@@ -40,6 +40,11 @@ const TemplateOverview = () => {
   const [publicTemplates, setPublicTemplates] = useState([]);
   const [loading, setLoading] = useState(false);
   const [searchQuery, setSearchQuery] = useState('');
+  const [searchResults, setSearchResults] = useState(null);
+  const [myCursor, setMyCursor] = useState(null);
+  const [publicCursor, setPublicCursor] = useState(null);
+  const [searchCursor, setSearchCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [activeTab, setActiveTab] = useState('my');
   const [selectedTemplate, setSelectedTemplate] = useState(null);
   const { token, user } = useAuthStore();
@@ -48,15 +53,34 @@ const TemplateOverview = () => {
     loadTemplates();
   }, []);
 
+  useEffect(() => {
+    const query = searchQuery.trim();
+    if (!query) {
+      setSearchResults(null);
+      setSearchCursor(null);
+      return;
+    }
+
+    const timer = setTimeout(async () => {
+      const page = await searchTemplates(token, query);
+      setSearchResults(page.items || []);
+      setSearchCursor(page.next_cursor);
+    }, 300);
+
+    return () => clearTimeout(timer);
+  }, [searchQuery, token]);
+
   const loadTemplates = async () => {
     setLoading(true);
     try {
-      const [myTpls, publicTpls] = await Promise.all([
+      const [myPage, publicPage] = await Promise.all([
         fetchMyTemplates(token),
         fetchPublicTemplates(token)
       ]);
-      setMyTemplates(myTpls || []);
-      setPublicTemplates(publicTpls || []);
+      setMyTemplates(myPage.items || []);
+      setMyCursor(myPage.next_cursor);
+      setPublicTemplates(publicPage.items || []);
+      setPublicCursor(publicPage.next_cursor);
     } catch (error) {
       message.error('Ошибка загрузки шаблонов');
     } finally {
@@ -64,6 +88,37 @@ const TemplateOverview = () => {
     }
   };
 
+  const loadMore = async (fetchPage, cursor, setItems, setCursor) => {
+    setLoadingMore(true);
+    try {
+      const page = await fetchPage(cursor);
+      setItems(prev => [...(prev || []), ...(page.items || [])]);
+      setCursor(page.next_cursor);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
+  const loadMoreMy = () => loadMore(
+    (cursor) => fetchMyTemplates(token, cursor), myCursor, setMyTemplates, setMyCursor
+  );
+
+  const loadMorePublic = () => searchResults
+    ? loadMore(
+        (cursor) => searchTemplates(token, searchQuery.trim(), cursor), searchCursor, setSearchResults, setSearchCursor
+      )
+    : loadMore(
+        (cursor) => fetchPublicTemplates(token, cursor), publicCursor, setPublicTemplates, setPublicCursor
+      );
+
+  const renderLoadMore = (cursor, onLoadMore) => cursor && (
+    <div style={{ textAlign: 'center', margin: '12px 0' }}>
+      <Button onClick={onLoadMore} loading={loadingMore}>
+        Загрузить ещё
+      </Button>
+    </div>
+  );
+
   const handleStarToggle = async (templateName) => {
     if (!token) {
       message.warning('Необходимо авторизоваться, чтобы ставить звезды');
@@ -71,39 +126,29 @@ const TemplateOverview = () => {
     }
 
     try {
-      const template = publicTemplates.find(t => t.name === templateName);
+      const template = (searchResults ?? publicTemplates).find(t => t.name === templateName);
       if (!template) return;
 
       const isStarred = template.starred_by_user;
+      const toggleStar = (prev) => prev && prev.map(t => 
+        t.name === templateName 
+          ? { 
+              ...t, 
+              stars: t.stars + (isStarred ? -1 : 1), 
+              starred_by_user: !isStarred 
+            } 
+          : t
+      );
+
       if (isStarred) {
         await unstarTemplate(token, templateName);
-        setPublicTemplates(prev => 
-          prev.map(t => 
-            t.name === templateName 
-              ? { 
-                  ...t, 
-                  stars: t.stars - 1, 
-                  starred_by_user: false 
-                } 
-              : t
-          )
-        );
         message.success('Звезда удалена');
       } else {
         await starTemplate(token, templateName);
-        setPublicTemplates(prev => 
-          prev.map(t => 
-            t.name === templateName 
-              ? { 
-                  ...t, 
-                  stars: t.stars + 1, 
-                  starred_by_user: true 
-                } 
-              : t
-          )
-        );
         message.success('Шаблон отмечен звездой');
       }
+      setPublicTemplates(toggleStar);
+      setSearchResults(toggleStar);
     } catch (error) {
       message.error(error.message || 'Ошибка при обновлении звезды');
     }
@@ -124,9 +169,7 @@ const TemplateOverview = () => {
     template.name.toLowerCase().includes(searchQuery.toLowerCase())
   );
 
-  const filteredPublicTemplates = publicTemplates.filter(template => 
-    template.name.toLowerCase().includes(searchQuery.toLowerCase())
-  );
+  const filteredPublicTemplates = searchResults ?? publicTemplates;
 
   const renderTemplateCard = (template, isPublic = false) => {
     const lastUpdated = dayjs(template.last_update).fromNow();
@@ -252,6 +295,7 @@ const TemplateOverview = () => {
               itemLayout="horizontal"
               dataSource={filteredMyTemplates}
               renderItem={template => renderTemplateCard(template)}
+              loadMore={renderLoadMore(myCursor, loadMoreMy)}
               locale={{ emptyText: 'У вас пока нет шаблонов' }}
               style={{ maxHeight: '60vh', overflowY: 'auto' }}
             />
@@ -275,6 +319,7 @@ const TemplateOverview = () => {
               itemLayout="horizontal"
               dataSource={filteredPublicTemplates}
               renderItem={template => renderTemplateCard(template, true)}
+              loadMore={renderLoadMore(searchResults ? searchCursor : publicCursor, loadMorePublic)}
               locale={{ emptyText: 'Нет доступных публичных шаблонов' }}
               style={{ maxHeight: '60vh', overflowY: 'auto' }}
             />
@@ -151,9 +151,14 @@ const RoomEditor = ({ isOwnerFromAccessCheck }) => {
       }
     };
 
-    if (isOwner && content && ytext.toString() === '') {
-      ytext.insert(0, content);
-    }
+    const seedContent = (isSynced) => {
+      if (isSynced && isOwner && content && ytext.toString() === '') {
+        ytext.insert(0, content);
+      }
+    };
+
+    seedContent(provider.synced);
+    provider.on('sync', seedContent);
 
     ytext.observe(observer);
 
@@ -198,6 +203,7 @@ const RoomEditor = ({ isOwnerFromAccessCheck }) => {
 
     return () => {
       ytext.unobserve(observer);
+      provider.off('sync', seedContent);
       provider.off('status', handleStatusChange);
       provider.off('error', handleError);
       if (provider.awareness) {
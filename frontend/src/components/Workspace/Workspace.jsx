@@ -25,6 +25,8 @@ const Workspace = () => {
   const { darkMode } = useThemeStore();
 
   const [rooms, setRooms] = useState([]);
+  const [roomsCursor, setRoomsCursor] = useState(null);
+  const [loadingMore, setLoadingMore] = useState(false);
   const [loading, setLoading] = useState(false);
   const [inviteModalOpen, setInviteModalOpen] = useState(false);
   const [currentRoom, setCurrentRoom] = useState(null);
@@ -43,8 +45,9 @@ const Workspace = () => {
   const loadInitialData = async () => {
     setLoading(true);
     try {
-      const roomsData = await fetchUserRooms(token);
-      setRooms(Array.isArray(roomsData) ? roomsData : []);
+      const page = await fetchUserRooms(token);
+      setRooms(Array.isArray(page.items) ? page.items : []);
+      setRoomsCursor(page.next_cursor);
     } catch (error) {
       message.error('Ошибка загрузки комнат: ' + (error.message || error));
     } finally {
@@ -52,6 +55,17 @@ const Workspace = () => {
     }
   };
 
+  const loadMoreRooms = async () => {
+    setLoadingMore(true);
+    try {
+      const page = await fetchUserRooms(token, roomsCursor);
+      setRooms(prev => [...prev, ...(Array.isArray(page.items) ? page.items : [])]);
+      setRoomsCursor(page.next_cursor);
+    } finally {
+      setLoadingMore(false);
+    }
+  };
+
   const handleNewDocument = () => {
     navigate('/workspace/new');
   };
@@ -117,6 +131,11 @@ const Workspace = () => {
                 </span>
               </Card>
             ))}
+            {roomsCursor && (
+              <Button block onClick={loadMoreRooms} loading={loadingMore}>
+                Загрузить ещё
+              </Button>
+            )}
           </div>
         </TabPane>
       </Tabs>
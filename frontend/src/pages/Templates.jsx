@@ -237,7 +237,7 @@ export const TemplateEditor = ({ onSave }) => {
   );
 };
 
-export const TemplateUpdater = ({ templates, onUpdate }) => {
+export const TemplateUpdater = ({ templates, onUpdate, hasMore = false, onLoadMore }) => {
   const { md } = useBreakpoint();
   const [selectedTemplate, setSelectedTemplate] = useState(null);
   const [updatedContent, setUpdatedContent] = useState('');
@@ -356,6 +356,12 @@ export const TemplateUpdater = ({ templates, onUpdate }) => {
               <Select
                 placeholder="Выберите шаблон для редактирования"
                 onChange={(name) => handleTemplateLoad(name)}
+                onPopupScroll={(e) => {
+                  const { scrollTop, clientHeight, scrollHeight } = e.target;
+                  if (hasMore && onLoadMore && scrollTop + clientHeight >= scrollHeight - 16) {
+                    onLoadMore();
+                  }
+                }}
                 loading={templateLoading}
                 style={{ width: '100%' }}
                 size="large"
@@ -465,6 +471,7 @@ export const TemplateUpdater = ({ templates, onUpdate }) => {
 export default function TemplateManager() {
   const screens = useBreakpoint();
   const [templates, setTemplates] = useState([]);
+  const [nextCursor, setNextCursor] = useState(null);
   const [activeTab, setActiveTab] = useState('create');
   const [loading, setLoading] = useState(false);
   const { token } = useAuthStore();
@@ -474,8 +481,9 @@ export default function TemplateManager() {
     
     setLoading(true);
     try {
-      const data = await fetchMyTemplates(token);
-      setTemplates(data || []);
+      const page = await fetchMyTemplates(token);
+      setTemplates(page.items || []);
+      setNextCursor(page.next_cursor);
     } catch (error) {
       message.error('Ошибка загрузки шаблонов');
     } finally {
@@ -483,6 +491,19 @@ export default function TemplateManager() {
     }
   }, [token]);
 
+  const loadMoreTemplates = useCallback(async () => {
+    if (!token || !nextCursor || loading) return;
+
+    setLoading(true);
+    try {
+      const page = await fetchMyTemplates(token, nextCursor);
+      setTemplates(prev => [...prev, ...(page.items || [])]);
+      setNextCursor(page.next_cursor);
+    } finally {
+      setLoading(false);
+    }
+  }, [token, nextCursor, loading]);
+
   useEffect(() => {
     loadTemplates();
   }, [loadTemplates]);
@@ -506,7 +527,14 @@ export default function TemplateManager() {
           <Text>Редактировать шаблон</Text>
         </Space>
       ),
-      children: <TemplateUpdater templates={templates} onUpdate={loadTemplates} />
+      children: (
+        <TemplateUpdater
+          templates={templates}
+          onUpdate={loadTemplates}
+          hasMore={Boolean(nextCursor)}
+          onLoadMore={loadMoreTemplates}
+        />
+      )
     }
   ];
 